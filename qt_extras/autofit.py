@@ -26,28 +26,256 @@ removed from the center to the ends, in keeping with the observation that:
   "aoccdrnig to a rscheearch at Cmabrigde Uinervtisy, it deosn’t mttaer in waht
   oredr the ltteers in a wrod are, the olny iprmoatnt tihng is taht the frist and
   lsat ltteer be in the rghit pclae."
+
+Results are kept in TEXT_CACHE, a TextCache shared by all widgets, so that
+shortening the same text in the same font to the same width is only worked out
+once. Text is measured using FONT_METRICS, a FontMetricsRegistry which shares
+one QFontMetrics, and the widths measured with it, between all the widgets which
+use the same font.
 """
+from bisect import bisect_right
+from collections import OrderedDict
 from functools import partial
-from PyQt5.QtGui import QFontMetrics
-from PyQt5.QtWidgets import QStyle, QStyleOptionButton, \
-							QPushButton, QCheckBox, QRadioButton, QLabel
+from itertools import accumulate
+from PyQt5.QtCore import Qt, QEvent, QTimer
+from PyQt5.QtGui import QFontMetrics, QGuiApplication, QPainter
+from PyQt5.QtWidgets import QStyle, QStyleOptionButton, QStylePainter, QSizePolicy, \
+							QWidget, QPushButton, QCheckBox, QRadioButton, QLabel
 
 
-__KEEPERS = list("bcdfghjklmnpqrstvwxyzBCDFGHJKLMNPQRSTVWXYZ0123456789")
+__KEEPERS = frozenset("bcdfghjklmnpqrstvwxyzBCDFGHJKLMNPQRSTVWXYZ0123456789")
 STYLE_OPTION = QStyleOptionButton()
 ELIDE_CHARS = '...'
 
 
+class TextCache:
+	"""
+	A bounded cache of shortened text, keyed on the kind of shortening, the text,
+	the font and the available width. When more than "capacity" results are kept,
+	the least recently used is discarded.
+	"""
+
+	def __init__(self, capacity = 2048):
+		self.capacity = capacity
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._entries = OrderedDict()
+
+	def __len__(self):
+		return len(self._entries)
+
+	def get(self, key):
+		"""
+		Returns the result cached for the given key, or None if there is none.
+		"""
+		result = self._entries.get(key)
+		if result is None:
+			self.misses += 1
+		else:
+			self.hits += 1
+			self._entries.move_to_end(key)
+		return result
+
+	def put(self, key, result):
+		self._entries[key] = result
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.capacity:
+			self._entries.popitem(last = False)
+			self.evictions += 1
+
+	def clear(self):
+		"""
+		Discards all cached results, e.g. after fonts or screens change.
+		"""
+		self._entries.clear()
+
+	def stats(self):
+		"""
+		Returns a dict of the cache's hit, miss and eviction counts, the ratio of hits
+		to lookups, and the number of results cached.
+		"""
+		lookups = self.hits + self.misses
+		return {
+			'hits'		: self.hits,
+			'misses'	: self.misses,
+			'hit_rate'	: self.hits / lookups if lookups else 0.0,
+			'evictions'	: self.evictions,
+			'size'		: len(self)
+		}
+
+
+TEXT_CACHE = TextCache()
+
+
+def clear_text_cache():
+	"""
+	Discards all the results kept in TEXT_CACHE.
+	"""
+	TEXT_CACHE.clear()
+
+
+class FontWidths:
+	"""
+	The QFontMetrics of one font, with the advance width of each character and the
+	bounding width of each text measured remembered. At most "capacity" text
+	widths are remembered; when there are more, all are forgotten.
+	"""
+
+	def __init__(self, font, capacity):
+		self.metrics = QFontMetrics(font)
+		self.capacity = capacity
+		self.hits = 0
+		self.misses = 0
+		self._advances = {}
+		self._widths = {}
+
+	def advance(self, char):
+		"""
+		Returns the horizontal advance of the given character.
+		"""
+		if (advance := self._advances.get(char)) is None:
+			advance = self._advances[char] = self.metrics.horizontalAdvance(char)
+		return advance
+
+	def width(self, text):
+		"""
+		Returns the width of the bounding rect of the given text.
+		"""
+		if (width := self._widths.get(text)) is None:
+			self.misses += 1
+			if len(self._widths) >= self.capacity:
+				self._widths.clear()
+			width = self._widths[text] = self.metrics.boundingRect(text).width()
+		else:
+			self.hits += 1
+		return width
+
+
+class FontMetricsRegistry:
+	"""
+	Keeps a FontWidths for each font (by QFont.key()), so that widgets which use
+	the same font share one.
+
+	Everything is forgotten when the logical DPI of the primary screen, which
+	QFontMetrics measures with, changes. "dpi" is that of the FontWidths kept.
+	"""
+
+	def __init__(self, capacity = 4096):
+		self.capacity = capacity
+		self.dpi = None
+		self.hits = 0
+		self.misses = 0
+		self.invalidations = 0
+		self._fonts = {}
+
+	def __len__(self):
+		return len(self._fonts)
+
+	def get(self, font):
+		"""
+		Returns the FontWidths of the given QFont.
+		"""
+		screen = QGuiApplication.primaryScreen()
+		dpi = None if screen is None else (screen.logicalDotsPerInchX(), screen.logicalDotsPerInchY())
+		if dpi != self.dpi:
+			if self._fonts:
+				self.invalidations += 1
+				self._fonts = {}
+			self.dpi = dpi
+		key = font.key()
+		if (widths := self._fonts.get(key)) is None:
+			self.misses += 1
+			widths = self._fonts[key] = FontWidths(font, self.capacity)
+		else:
+			self.hits += 1
+		return widths
+
+	def clear(self):
+		"""
+		Forgets all fonts and the widths measured with them.
+		"""
+		self._fonts = {}
+
+	def stats(self):
+		"""
+		Returns a dict of the font lookup hit and miss counts and ratio, the number of
+		fonts and invalidations, and the hit and miss counts and ratio of text widths
+		looked up, summed over all fonts.
+		"""
+		lookups = self.hits + self.misses
+		width_hits = sum(widths.hits for widths in self._fonts.values())
+		width_misses = sum(widths.misses for widths in self._fonts.values())
+		width_lookups = width_hits + width_misses
+		return {
+			'hits'				: self.hits,
+			'misses'			: self.misses,
+			'hit_rate'			: self.hits / lookups if lookups else 0.0,
+			'fonts'				: len(self),
+			'invalidations'		: self.invalidations,
+			'width_hits'		: width_hits,
+			'width_misses'		: width_misses,
+			'width_hit_rate'	: width_hits / width_lookups if width_lookups else 0.0
+		}
+
+
+FONT_METRICS = FontMetricsRegistry()
+
+
+__MARGINS = {}
+
 def available_width(widget):
+	"""
+	Returns the width inside the widget which its text can use.
+
+	The difference between the widget's width and that of its contents rect is
+	asked of the style only once per style, widget class and font, and remembered.
+	Widgets styled by a style sheet may each have their own, so it is only
+	remembered for widgets with an effect applied (or paint-time widgets), which
+	forget it on a StyleChange or FontChange event.
+	"""
 	if isinstance(widget, QLabel):
 		return widget.width() - 2
-	if isinstance(widget, QPushButton):
-		subelem = QStyle.SE_PushButtonContents
-	elif isinstance(widget, QCheckBox):
-		subelem = QStyle.SE_CheckBoxContents
-	else:
-		subelem = QStyle.SE_RadioButtonContents
-	return widget.width() + widget.style().subElementRect(subelem, STYLE_OPTION, widget).width()
+	if (margin := getattr(widget, 'qtxtra_margin', None)) is None:
+		margin = __contents_margin(widget)
+		if hasattr(widget, 'qtxtra_margin'):
+			widget.qtxtra_margin = margin
+	return widget.width() + margin
+
+def __contents_margin(widget):
+	style = widget.style()
+	shared = style.metaObject().className() != 'QStyleSheetStyle'
+	key = (style, type(widget), widget.font().key())
+	if not shared or (margin := __MARGINS.get(key)) is None:
+		if isinstance(widget, QPushButton):
+			subelem = QStyle.SE_PushButtonContents
+		elif isinstance(widget, QCheckBox):
+			subelem = QStyle.SE_CheckBoxContents
+		else:
+			subelem = QStyle.SE_RadioButtonContents
+		margin = style.subElementRect(subelem, STYLE_OPTION, widget).width()
+		if shared:
+			__MARGINS[key] = margin
+	return margin
+
+def __remember_margin(widget):
+	"""
+	Makes "available_width()" remember the contents margin of the widget until its
+	style or font changes.
+	"""
+	if not hasattr(widget, 'qtxtra_margin'):
+		widget.qtxtra_margin = None
+		widget.qtxtra_change_event = widget.changeEvent
+		widget.changeEvent = partial(__change, widget)
+
+def __change(widget, event):
+	if event.type() in (QEvent.StyleChange, QEvent.FontChange):
+		widget.qtxtra_margin = None
+		# The text no longer fits the width it was fitted to; fit it on the next resize.
+		for effect in ('autofit', 'elide'):
+			if hasattr(widget, f'qtxtra_{effect}_width'):
+				setattr(widget, f'qtxtra_{effect}_width', None)
+	widget.qtxtra_change_event(event)
 
 
 # ----------------------
@@ -62,36 +290,94 @@ def abbreviated_text(widget, text, *, fixed_width = None):
 	if len(text) == 1:
 		return text
 	available = fixed_width or available_width(widget)
-	metrics = QFontMetrics(widget.font())
+	font = widget.font()
+	widths = FONT_METRICS.get(font)
+	return __cached('abbreviated', __abbreviate, widths, font.key(), text, available)
+
+def __abbreviate(widths, text, available):
+	"""
+	Removes characters from "text" until it fits in "available", or only one
+	character is left.
+
+	Which character is removed next does not depend on the width of any character,
+	so the order of removal is planned first. The number of removals needed is
+	estimated from the advance widths of the characters removed, then corrected by
+	measuring the text the same way as before, so that the result is the same. The
+	text is put together once for each measurement, rather than once per removal.
+	"""
+	if len(text) <= 1 or widths.width(text) <= available:
+		return text
+	advance = widths.advance
+	plan = __removal_order(text)
+	removed = []
+	width = sum(advance(char) for char in text)
+	for index in plan:
+		removed.append(index)
+		width -= advance(text[index])
+		if width <= available:
+			break
+
+	def shortened(count):
+		gone = set(removed[:count])
+		return ''.join(char for index, char in enumerate(text) if not index in gone)
+
+	count = len(removed)
+	if widths.width(shortened(count)) <= available:
+		while count > 1 and widths.width(shortened(count - 1)) <= available:
+			count -= 1
+	else:
+		for index in plan:
+			removed.append(index)
+			count += 1
+			if widths.width(shortened(count)) <= available:
+				break
+	return shortened(count)
+
+def __removal_order(text):
+	"""
+	Generates the indexes of the characters of "text" in the order in which they
+	are removed: each time, the nearest character to the center which is not in
+	__KEEPERS, searching towards the front and towards the back by turns, or the
+	center character if there is none. The last character is never removed.
+	"""
+	remaining = list(range(len(text)))
+	removable = sum(not char in __KEEPERS for char in text)
 	remove_front = True
-	while len(text) > 1 and metrics.boundingRect(text).width() > available:
-		mid = len(text) // 2
-		pop = None
-		if remove_front:
-			for i in range(mid, 0, -1):
-				if not text[i] in __KEEPERS:
-					pop = i
-					break
-		else:
-			for i in range(mid, len(text)):
-				if not text[i] in __KEEPERS:
+	while len(remaining) > 1:
+		mid = len(remaining) // 2
+		pop = mid
+		if removable:
+			for i in range(mid, 0, -1) if remove_front else range(mid, len(remaining)):
+				if not text[remaining[i]] in __KEEPERS:
 					pop = i
+					removable -= 1
 					break
-		if pop is None:
-			pop = mid
-		text = text[:pop] + text[pop + 1:]
+		yield remaining.pop(pop)
 		remove_front = not remove_front
-	return text
 
 def __set_abbreviated_text(widget, text):
 	widget.qtxtra_autofit_text = text
-	widget.qtxtra_autofit_set_text(abbreviated_text(widget, widget.qtxtra_autofit_text))
+	__fit_abbreviated(widget, available_width(widget))
 
 def __resize_abbreviated(widget, event):
 	widget.qtxtra_autofit_resize_event(event)
-	widget.qtxtra_autofit_set_text(abbreviated_text(widget, widget.qtxtra_autofit_text))
+	if widget.qtxtra_autofit_defer is None:
+		__refit_abbreviated(widget)
+	else:
+		widget.qtxtra_autofit_defer()
+
+def __refit_abbreviated(widget):
+	available = available_width(widget)
+	if available != widget.qtxtra_autofit_width:
+		__fit_abbreviated(widget, available)
 
-def autofit(widget):
+def __fit_abbreviated(widget, available):
+	widget.qtxtra_autofit_width = available
+	text = abbreviated_text(widget, widget.qtxtra_autofit_text, fixed_width = available)
+	if text != widget.text():
+		widget.qtxtra_autofit_set_text(text)
+
+def autofit(widget, *, deferred = False):
 	"""
 	Applies the "autofit" effect on a QPushButton, QCheckBox, QRadioButton, or QLabel.
 
@@ -102,7 +388,13 @@ def autofit(widget):
 
 	After applying the effect, when the widget's text is changed using
 	"setText", or when the widget is resized, the text will be abrreviated if
-	necessary to fit inside the available space.
+	necessary to fit inside the available space. A resize which leaves the
+	available space unchanged does nothing, unless the font or style of the
+	widget has changed since the text was last fitted.
+
+	If "deferred" is True, the text is fitted after a resize once the events
+	already waiting have been processed, so that a burst of resize events results
+	in the text being fitted once.
 
 	You should apply this effect in you form's constructor. Applying the effect
 	after the form is shown can cause an endless recursion!
@@ -110,39 +402,114 @@ def autofit(widget):
 	if not isinstance(widget, (QPushButton, QCheckBox, QRadioButton, QLabel)):
 		raise AttributeError('Cannot apply autofit effect to this widget')
 	widget.qtxtra_autofit_text = ""
+	widget.qtxtra_autofit_width = None
+	widget.qtxtra_autofit_defer = __fit_timer(widget, __refit_abbreviated).start if deferred else None
 	widget.qtxtra_autofit_set_text = widget.setText
 	widget.qtxtra_autofit_resize_event = widget.resizeEvent
+	__remember_margin(widget)
 	widget.setText = partial(__set_abbreviated_text, widget)
 	widget.resizeEvent = partial(__resize_abbreviated, widget)
 
+def autofit_all(container, *, recursive = True):
+	"""
+	Applies the "autofit" effect on every QPushButton, QCheckBox, QRadioButton, and
+	QLabel inside "container", keeping the text they already have, and returns
+	them in a list.
+
+	Usage:
+
+		form.setupUi(self)
+		autofit_all(self)
+
+	Rather than each widget fitting its own text when it is resized, the widgets
+	resized are fitted together once the events already waiting have been
+	processed, i.e. once per layout pass. They are grouped by font and available
+	width, and each different text in a group is shortened only once.
+
+	Widgets added to the container afterwards are not included. If "recursive" is
+	False, only the direct children of the container are included.
+	"""
+	return __apply_all(container, 'autofit', autofit, partial(__refit_group,
+		'autofit', 'abbreviated', __abbreviate), recursive)
+
 
 # ----------------------
 # AutoElide
 
-def elided_text(widget, text, *, fixed_width = None):
+def elided_text(widget, text, *, fixed_width = None, mode = None):
 	"""
 	Shortens the text to fit buttons, labels, etc. by adding an elide mark "..."
+
+	If "mode" is one of Qt.ElideLeft, Qt.ElideMiddle or Qt.ElideRight, the text is
+	elided by QFontMetrics.elidedText() instead, which is done in C++ and marks the
+	elided part with an ellipsis character "…" rather than ELIDE_CHARS.
 	"""
 	if len(text) == 1:
 		return text
 	available = fixed_width or available_width(widget)
-	metrics = QFontMetrics(widget.font())
-	elide_width = metrics.boundingRect(ELIDE_CHARS).width()
-	elide_chars = ''
-	while len(text) > 1 and (metrics.boundingRect(text).width() + elide_width) > available:
-		text = text[:-1]
-		elide_chars = ELIDE_CHARS
-	return text + elide_chars
+	font = widget.font()
+	widths = FONT_METRICS.get(font)
+	return __cached(*__elide_engine(mode), widths, font.key(), text, available)
+
+def __elide_engine(mode):
+	"""
+	Returns the cache kind and the engine which elide in the given mode.
+	"""
+	if mode is None:
+		return 'elided', __elide
+	return ('elided', int(mode)), partial(__elide_native, mode)
+
+def __elide_native(mode, widths, text, available):
+	return widths.metrics.elidedText(text, mode, available)
+
+def __elide(widths, text, available):
+	"""
+	Returns the longest start of "text" (at least one character) which fits in
+	"available" with ELIDE_CHARS appended, or "text" itself if it fits with room for
+	ELIDE_CHARS to spare.
+
+	The length is first estimated from the advance widths of the characters, found
+	with a binary search on their running total, then corrected by measuring the
+	text the same way as before, so that the result is the same.
+	"""
+	elide_width = widths.width(ELIDE_CHARS)
+	if len(text) <= 1 or widths.width(text) + elide_width <= available:
+		return text
+	budget = available - elide_width
+	length = bisect_right(list(accumulate(map(widths.advance, text))), budget)
+	length = min(max(length, 1), len(text) - 1)
+	if widths.width(text[:length]) <= budget:
+		while length + 1 < len(text) and widths.width(text[:length + 1]) <= budget:
+			length += 1
+	else:
+		while length > 1 and widths.width(text[:length]) > budget:
+			length -= 1
+	return text[:length] + ELIDE_CHARS
 
 def __set_elided_text(widget, text):
 	widget.qtxtra_elide_text = text
-	widget.qtxtra_elide_set_text(elided_text(widget, widget.qtxtra_elide_text))
+	__fit_elided(widget, available_width(widget))
 
 def __resize_elided(widget, event):
 	widget.qtxtra_elide_resize_event(event)
-	widget.qtxtra_elide_set_text(elided_text(widget, widget.qtxtra_elide_text))
+	if widget.qtxtra_elide_defer is None:
+		__refit_elided(widget)
+	else:
+		widget.qtxtra_elide_defer()
+
+def __refit_elided(widget):
+	available = available_width(widget)
+	if available != widget.qtxtra_elide_width:
+		__fit_elided(widget, available)
+
+def __fit_elided(widget, available):
+	widget.qtxtra_elide_width = available
+	text = elided_text(widget, widget.qtxtra_elide_text, fixed_width = available,
+		mode = widget.qtxtra_elide_mode)
+	if text != widget.text():
+		widget.qtxtra_elide_set_text(text)
 
-def elide(widget):
+def elide(widget, *, deferred = False, mode = None):
 	"""
 	Applies the "elide" effect on a QPushButton, QCheckBox, QRadioButton, or QLabel.
 
@@ -153,7 +520,15 @@ def elide(widget):
 
 	After applying the effect, when the widget's text is changed using
 	"setText", or when the widget is resized, the text will be abrreviated if
-	necessary to fit inside the available space.
+	necessary to fit inside the available space. A resize which leaves the
+	available space unchanged does nothing, unless the font or style of the
+	widget has changed since the text was last fitted.
+
+	If "deferred" is True, the text is fitted after a resize once the events
+	already waiting have been processed, as with "autofit()".
+
+	If "mode" is Qt.ElideLeft, Qt.ElideMiddle or Qt.ElideRight, the text is elided
+	by Qt, as with "elided_text()".
 
 	You should apply this effect in you form's constructor. Applying the effect
 	after the form is shown can cause an endless recursion!
@@ -161,10 +536,202 @@ def elide(widget):
 	if not isinstance(widget, (QPushButton, QCheckBox, QRadioButton, QLabel)):
 		raise AttributeError('Cannot apply elide effect to this widget')
 	widget.qtxtra_elide_text = ""
+	widget.qtxtra_elide_width = None
+	widget.qtxtra_elide_mode = mode
+	widget.qtxtra_elide_defer = __fit_timer(widget, __refit_elided).start if deferred else None
 	widget.qtxtra_elide_set_text = widget.setText
 	widget.qtxtra_elide_resize_event = widget.resizeEvent
+	__remember_margin(widget)
 	widget.setText = partial(__set_elided_text, widget)
 	widget.resizeEvent = partial(__resize_elided, widget)
 
+def elide_all(container, *, recursive = True, mode = None):
+	"""
+	Applies the "elide" effect on every QPushButton, QCheckBox, QRadioButton, and
+	QLabel inside "container", keeping the text they already have, and returns
+	them in a list. The widgets are fitted together, as with "autofit_all()".
+	"mode" is used for all of them, as with "elide()".
+	"""
+	return __apply_all(container, 'elide', partial(elide, mode = mode),
+		partial(__refit_group, 'elide', *__elide_engine(mode)), recursive)
+
+
+# ----------------------
+# Paint-time widgets
+
+class ElidedLabel(QLabel):
+	"""
+	A QLabel which keeps its full text, and elides it only when painting, to fit
+	the width it has at the time. Unlike the "elide" effect, resizing does not
+	change the text, so it does not cause another layout pass. "text()" returns the
+	full text.
+
+	The minimum width is that of the first character and the elide mark, so that
+	layouts can shrink the label. Only plain, single-line text is supported.
+
+	"setElideMode()" with Qt.ElideLeft, Qt.ElideMiddle or Qt.ElideRight elides with
+	QFontMetrics.elidedText() instead, as "elided_text()" does.
+	"""
+
+	def __init__(self, *args):
+		super().__init__(*args)
+		self.__mode = None
+		self.__fitted = (None, None)
+
+	def elideMode(self):
+		return self.__mode
+
+	def setElideMode(self, mode):
+		self.__mode = mode
+		self.__fitted = (None, None)
+		self.update()
+
+	def minimumSizeHint(self):
+		size = super().minimumSizeHint()
+		widths = FONT_METRICS.get(self.font())
+		text = self.text()
+		if len(text) > 1:
+			size.setWidth(size.width() - widths.width(text) + widths.width(text[:1] + ELIDE_CHARS))
+		return size
+
+	def paintEvent(self, event):
+		painter = QPainter(self)
+		self.drawFrame(painter)
+		rect = self.contentsRect()
+		margin = self.margin()
+		rect.adjust(margin, margin, -margin, -margin)
+		self.style().drawItemText(painter, rect,
+			QStyle.visualAlignment(self.layoutDirection(), self.alignment()),
+			self.palette(), self.isEnabled(), self.__fitted_text(rect.width()),
+			self.foregroundRole())
+
+	def __fitted_text(self, available):
+		key = (self.text(), self.font().key(), available)
+		if key != self.__fitted[0]:
+			self.__fitted = (key, elided_text(self, key[0], fixed_width = max(available, 1),
+				mode = self.__mode))
+		return self.__fitted[1]
+
+
+class AutoFitButton(QPushButton):
+	"""
+	A QPushButton which keeps its full text, and abbreviates it (as the "autofit"
+	effect does) only when painting, to fit the width it has at the time. Resizing
+	does not change the text, so it does not cause another layout pass. "text()"
+	returns the full text.
+
+	The minimum width is that of the button with only the first character of the
+	text, and the horizontal size policy is Preferred, so that layouts can shrink
+	the button.
+	"""
+
+	def __init__(self, *args):
+		super().__init__(*args)
+		self.setSizePolicy(QSizePolicy.Preferred, self.sizePolicy().verticalPolicy())
+		self.qtxtra_margin = None
+		self.__fitted = (None, None)
+
+	def changeEvent(self, event):
+		if event.type() in (QEvent.StyleChange, QEvent.FontChange):
+			self.qtxtra_margin = None
+		super().changeEvent(event)
+
+	def minimumSizeHint(self):
+		size = super().minimumSizeHint()
+		widths = FONT_METRICS.get(self.font())
+		text = self.text()
+		if len(text) > 1:
+			size.setWidth(size.width() - widths.width(text) + widths.width(text[:1]))
+		return size
+
+	def paintEvent(self, event):
+		option = QStyleOptionButton()
+		self.initStyleOption(option)
+		option.text = self.__fitted_text(available_width(self))
+		QStylePainter(self).drawControl(QStyle.CE_PushButton, option)
+
+	def __fitted_text(self, available):
+		key = (self.text(), self.font().key(), available)
+		if key != self.__fitted[0]:
+			self.__fitted = (key, abbreviated_text(self, key[0], fixed_width = max(available, 1)))
+		return self.__fitted[1]
+
+
+# ----------------------
+# Common
+
+def __cached(kind, engine, widths, font_key, text, available):
+	"""
+	Returns "text" shortened by "engine" to fit in "available", from TEXT_CACHE if
+	it has been shortened the same way before.
+	"""
+	key = (kind, text, font_key, FONT_METRICS.dpi, available)
+	if (result := TEXT_CACHE.get(key)) is None:
+		result = engine(widths, text, available)
+		TEXT_CACHE.put(key, result)
+	return result
+
+def __apply_all(container, effect, apply, refit, recursive):
+	"""
+	Applies an effect on the eligible widgets inside "container", in one pass over
+	its children, and makes them wait in the container's set of pending widgets
+	when resized, to be fitted together by "refit", called with the container.
+	"""
+	pending = {}
+	defer = __fit_timer(container, refit).start
+	setattr(container, f'qtxtra_{effect}_pending', pending)
+	widgets = [ widget for widget in container.findChildren(QWidget,
+		options = Qt.FindChildrenRecursively if recursive else Qt.FindDirectChildrenOnly)
+		if isinstance(widget, (QPushButton, QCheckBox, QRadioButton, QLabel)) ]
+	for widget in widgets:
+		if not hasattr(widget, f'qtxtra_{effect}_text'):
+			apply(widget)
+			setattr(widget, f'qtxtra_{effect}_text', widget.text())
+		setattr(widget, f'qtxtra_{effect}_defer', partial(__defer_to_group, pending, defer, widget))
+		widget.destroyed.connect(partial(pending.pop, widget, None))
+		pending[widget] = None
+	if pending:
+		defer()
+	return widgets
+
+def __defer_to_group(pending, defer, widget):
+	pending[widget] = None
+	defer()
+
+def __refit_group(effect, kind, engine, container):
+	"""
+	Fits the text of the pending widgets of "container" whose available width has
+	changed. The widgets are grouped by font and available width; in each group,
+	the font is looked up once, and each different text is shortened once.
+	"""
+	pending = getattr(container, f'qtxtra_{effect}_pending')
+	widgets = list(pending)
+	pending.clear()
+	groups = {}
+	for widget in widgets:
+		available = available_width(widget)
+		if available != getattr(widget, f'qtxtra_{effect}_width'):
+			groups.setdefault((widget.font().key(), available), []).append(widget)
+	for (font_key, available), group in groups.items():
+		widths = FONT_METRICS.get(group[0].font())
+		results = {}
+		for widget in group:
+			setattr(widget, f'qtxtra_{effect}_width', available)
+			text = getattr(widget, f'qtxtra_{effect}_text')
+			if (result := results.get(text)) is None:
+				result = results[text] = __cached(kind, engine, widths, font_key, text, available)
+			if result != widget.text():
+				getattr(widget, f'qtxtra_{effect}_set_text')(result)
+
+def __fit_timer(widget, refit):
+	"""
+	Returns a single-shot timer, owned by the widget, which calls "refit" with the
+	widget. Starting the timer again before it fires does not add another call.
+	"""
+	timer = QTimer(widget)
+	timer.setSingleShot(True)
+	timer.timeout.connect(partial(refit, widget))
+	return timer
+
 
 #  end qt_extras/qt_extras/autofit.py
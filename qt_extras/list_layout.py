@@ -21,23 +21,84 @@
 "Collection" layouts which act like lists.
 """
 from math import ceil
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSignal, QEvent, QTimer
 from PyQt5.QtWidgets import QHBoxLayout, QVBoxLayout, QGridLayout, QSpacerItem, QSizePolicy
 
 HORIZONTAL_FLOW = 0
 VERTICAL_FLOW = 1
 
+GRID_PACKING = 0
+BALANCED_PACKING = 1
+
+# balanced_flow_scenario() puts no more than this many items in one line, which
+# bounds its cost when items have (almost) no size.
+BALANCED_LINE_LIMIT = 256
+
+
+class DeferredUpdates:
+	"""
+	A context manager which suspends repositioning of widgets and the emission of
+	"sig_len_changed" in one or more list layouts. When the context exits, each
+	layout is laid out once and emits "sig_len_changed" once (if anything in the
+	block changed its length). For example:
+
+		with DeferredUpdates(layout):
+			for widget in widgets:
+				layout.insert(0, widget)
+
+	Every list layout also provides a "batch()" method which does the same:
+
+		with layout.batch():
+			...
+
+	"""
+
+	def __init__(self, *layouts):
+		self.layouts = layouts
+
+	def __enter__(self):
+		for layout in self.layouts:
+			layout._begin_deferred()					# pylint: disable = protected-access
+
+	def __exit__(self, *_):
+		for layout in self.layouts:
+			layout._end_deferred()						# pylint: disable = protected-access
+
 
 class _ListLayout:
 	"""
 	Abstract class which is the base of the list layouts.
+
+	Keeps an index of each item's position in "self.items", keyed on the id of the
+	item, so that membership tests and position lookups do not need to scan the
+	list. An insert or delete leaves the positions from there on stale. Items in
+	the stale part are found with list.index() from its start, and the stale part
+	is only renumbered once such scans have cost RENUMBER_SCANS times its length,
+	so that mixing changes and lookups costs no more than scanning would.
+
+	Widgets removed from the layout are deleted, unless "pool" is set to a
+	WidgetPool, in which case they are hidden and kept there for reuse:
+
+		layout.pool = WidgetPool()
+		layout.clear()
+		widget = layout.acquire(Row) or Row(frame)
+
 	"""
 
 	sig_len_changed = pyqtSignal()
 
+	# Renumbering an item costs about as much as list.index() comparing ten.
+	RENUMBER_SCANS = 8
+
 	def __init__(self):
 		super().__init__()
 		self.items = []
+		self._positions = {}
+		self._stale_from = 0
+		self._scanned = 0
+		self._deferring = 0
+		self._len_change_pending = False
+		self.pool = None
 
 	def __iter__(self):
 		return self.items.__iter__()
@@ -46,7 +107,11 @@ class _ListLayout:
 		return self.items.__reversed__()
 
 	def __contains__(self, item):
-		return item in self.items
+		try:
+			self._position(item)
+		except ValueError:
+			return False
+		return True
 
 	def __len__(self):
 		return len(self.items)
@@ -58,34 +123,193 @@ class _ListLayout:
 		return self.items[idx]
 
 	def swap(self, item_a, item_b):
-		if not item_a in self.items or not item_b in self.items:
-			raise ValueError("Item not in list layout")
-		index_a = self.items.index(item_a)
-		index_b = self.items.index(item_b)
+		index_a = self._position(item_a)
+		index_b = self._position(item_b)
 		if index_a < index_b:
 			self.replaceWidget(item_a, item_b)			# pylint: disable = no-member
 			self.insertWidget(index_b, item_a)			# pylint: disable = no-member
 		else:
 			self.replaceWidget(item_b, item_a)			# pylint: disable = no-member
 			self.insertWidget(index_a, item_b)			# pylint: disable = no-member
-		self.items[index_a] = item_b
-		self.items[index_b] = item_a
+		self._items_swap(index_a, index_b)
 
 	def clear(self):
 		"""
-		Clears (and deletes) all the widgets in this layout.
+		Clears (and deletes, or releases to the pool) all the widgets in this layout.
+
+		Every widget in the list is discarded, including those which are not in the
+		Qt layout at the moment, e.g. because updates are deferred.
 		"""
-		while item := self.takeAt(0):					# pylint: disable = no-member
-			if widget := item.widget():
-				widget.deleteLater()
-		self.items = []
-		self.sig_len_changed.emit()
+		while self.takeAt(0):							# pylint: disable = no-member
+			pass
+		for item in self.items:
+			self._discard(item, in_layout = False)
+		self._items_clear()
+		self._len_changed()
 
 	def count(self):
 		return len(self.items)
 
 	def index(self, item):
-		return self.items.index(item)
+		return self._position(item)
+
+	def acquire(self, kind):
+		"""
+		Returns a widget of the given type from this layout's pool, or None if there
+		is no pool or no pooled widget of that type.
+		"""
+		return None if self.pool is None else self.pool.acquire(kind)
+
+	def batch(self):
+		"""
+		Returns a context manager which defers relayout and "sig_len_changed" until
+		the end of the block. See DeferredUpdates.
+		"""
+		return DeferredUpdates(self)
+
+	def _discard(self, widget, *, in_layout = True):
+		"""
+		Deletes a widget which was removed from the list, or releases it to the pool.
+		"""
+		if self.pool is None:
+			widget.deleteLater()
+		else:
+			if in_layout:
+				self.removeWidget(widget)				# pylint: disable = no-member
+			self.pool.release(widget)
+
+	def _len_changed(self):
+		if self._deferring:
+			self._len_change_pending = True
+		else:
+			self.sig_len_changed.emit()
+
+	def _begin_deferred(self):
+		self._deferring += 1
+
+	def _end_deferred(self):
+		self._deferring -= 1
+		if self._deferring == 0:
+			self._apply_deferred()
+			if self._len_change_pending:
+				self._len_change_pending = False
+				self.sig_len_changed.emit()
+
+	def _apply_deferred(self):
+		"""
+		Called when the outermost DeferredUpdates context exits. Layouts which
+		postpone repositioning while deferring override this.
+		"""
+
+	def _position(self, item):
+		"""
+		Returns the index of the given item in "self.items".
+		Raises ValueError if the item is not in this layout.
+		"""
+		if len(self._positions) != len(self.items):
+			self._forget_positions()
+		index = self._positions.get(id(item))
+		if index is not None and index < self._stale_from:
+			if self.items[index] is item:
+				return index
+			self._forget_positions()
+		try:
+			index = self.items.index(item, self._stale_from)
+		except ValueError:
+			if index is None or self._stale_from == 0:
+				self._scanned_to(len(self.items) - 1)
+				raise ValueError("Item not in list layout") from None
+			# Only items which are in the list have a position, so it was modified.
+			self._forget_positions()
+			return self._position(item)
+		self._scanned_to(index)
+		return index
+
+	def _forget_positions(self):
+		"""
+		Called when "self.items" was modified without going through the _items_*
+		methods, which leaves every position stale.
+		"""
+		self._positions = {}
+		self._stale_from = 0
+
+	def _scanned_to(self, index):
+		"""
+		Counts a scan of the stale positions up to "index", and renumbers them if the
+		scans since they were last renumbered have cost enough.
+		"""
+		self._scanned += index + 1 - self._stale_from
+		if self._scanned >= self.RENUMBER_SCANS * (len(self.items) - self._stale_from):
+			self._renumber()
+
+	def _renumber(self):
+		"""
+		Brings the position index up to date with "self.items".
+		"""
+		start = self._stale_from
+		self._positions.update(zip(map(id, self.items[start:]), range(start, len(self.items))))
+		self._stale_from = len(self.items)
+		self._scanned = 0
+
+	def _items_append(self, item):
+		self.items.append(item)
+		if self._stale_from == len(self.items) - 1:
+			self._stale_from += 1
+		self._positions[id(item)] = len(self.items) - 1
+
+	def _items_insert(self, index, item):
+		self.items.insert(index, item)
+		self._positions[id(item)] = index
+		self._stale_from = min(self._stale_from, index + 1)
+
+	def _items_extend(self, items):
+		start = len(self.items)
+		self.items.extend(items)
+		for index in range(start, len(self.items)):
+			self._positions[id(self.items[index])] = index
+		if self._stale_from == start:
+			self._stale_from = len(self.items)
+
+	def _items_insert_many(self, index, items):
+		self.items[index:index] = items
+		for offset, item in enumerate(items):
+			self._positions[id(item)] = index + offset
+		self._stale_from = min(self._stale_from, index + len(items))
+
+	def _items_delete(self, index):
+		self._positions.pop(id(self.items[index]), None)
+		del self.items[index]
+		self._stale_from = min(self._stale_from, index)
+
+	def _items_delete_many(self, indexes):
+		"""
+		Deletes the items at each of the given (unique) indexes in one pass.
+		"""
+		for index in indexes:
+			self._positions.pop(id(self.items[index]), None)
+		self.items = [ item for index, item in enumerate(self.items) if not index in indexes ]
+		self._stale_from = min(self._stale_from, min(indexes))
+
+	def _items_swap(self, index_a, index_b):
+		item_a = self.items[index_a]
+		item_b = self.items[index_b]
+		self.items[index_a] = item_b
+		self.items[index_b] = item_a
+		self._positions[id(item_b)] = index_a
+		self._positions[id(item_a)] = index_b
+
+	def _positions_of(self, items):
+		"""
+		Returns a set of the indexes of all the given items.
+		Raises ValueError if any of the items is not in this layout.
+		"""
+		return { self._position(item) for item in items }
+
+	def _items_clear(self):
+		self.items = []
+		self._positions = {}
+		self._stale_from = 0
+		self._scanned = 0
 
 
 class _ListLinearLayout(_ListLayout):
@@ -96,27 +320,34 @@ class _ListLinearLayout(_ListLayout):
 	def remove(self, item):
 		"""
 		Removes the item from the layout, and calls "item.deleteLater()" to actually
-		delete the widget.
+		delete the widget (or releases it to the pool, if this layout has one).
 		"""
-		if item not in self.items:
-			raise ValueError("Item not in list layout")
-		index = self.items.index(item)
-		del self.items[index]
-		item.deleteLater()
-		self.sig_len_changed.emit()
+		index = self._position(item)
+		self._items_delete(index)
+		self._discard(item)
+		self._len_changed()
+
+	def remove_many(self, items):
+		"""
+		Removes all the given items from the layout, calling "deleteLater()" on each,
+		and emits "sig_len_changed" once. An item given more than once is removed once.
+		"""
+		items = list(dict.fromkeys(items))
+		if not items:
+			return
+		self._items_delete_many(self._positions_of(items))
+		for item in items:
+			self._discard(item)
+		self._len_changed()
 
 	def move_previous(self, item):
-		if item not in self.items:
-			raise ValueError("Item not in list layout")
-		index = self.items.index(item)
+		index = self._position(item)
 		if index == 0:
 			raise ValueError("Item is first in layout")
 		self.swap(item, self.items[index - 1])
 
 	def move_next(self, item):
-		if item not in self.items:
-			raise ValueError("Item not in list layout")
-		index = self.items.index(item)
+		index = self._position(item)
 		if index == len(self.items) - 1:
 			raise ValueError("Item is last in layout")
 		self.swap(item, self.items[index + 1])
@@ -142,8 +373,8 @@ class _ListBoxLayout(_ListLinearLayout):
 			self.addWidget(item)						# pylint: disable = no-member
 		else:
 			self.insertWidget(len(self.items), item)	# pylint: disable = no-member
-		self.items.append(item)
-		self.sig_len_changed.emit()
+		self._items_append(item)
+		self._len_changed()
 
 	def insert(self, index, item):
 		if not 0 <= index <= len(self.items):
@@ -151,9 +382,41 @@ class _ListBoxLayout(_ListLinearLayout):
 		if index == len(self.items):
 			self.append(item)
 		else:
-			self.items.insert(index, item)
+			self._items_insert(index, item)
 			self.insertWidget(index, item)				# pylint: disable = no-member
-		self.sig_len_changed.emit()
+		self._len_changed()
+
+	def extend(self, items):
+		"""
+		Appends all the given items, emitting "sig_len_changed" once.
+		"""
+		items = list(items)
+		if not items:
+			return
+		for offset, item in enumerate(items, len(self.items)):
+			if self.end_space is None:
+				self.addWidget(item)					# pylint: disable = no-member
+			else:
+				self.insertWidget(offset, item)			# pylint: disable = no-member
+		self._items_extend(items)
+		self._len_changed()
+
+	def insert_many(self, index, items):
+		"""
+		Inserts all the given items starting at "index", emitting "sig_len_changed" once.
+		"""
+		if not 0 <= index <= len(self.items):
+			raise IndexError()
+		items = list(items)
+		if not items:
+			return
+		if index == len(self.items):
+			self.extend(items)
+			return
+		for offset, item in enumerate(items, index):
+			self.insertWidget(offset, item)				# pylint: disable = no-member
+		self._items_insert_many(index, items)
+		self._len_changed()
 
 	def clear(self):
 		super().clear()
@@ -190,6 +453,9 @@ class GListLayout(_ListLayout, QGridLayout):
 
 		lo = GListLayout(4, flow = HORIZONTAL_FLOW)
 
+	Items which move to another cell because of an insert, remove or swap keep
+	their QLayoutItem, which is moved with "addItem()". Only widgets new to the
+	layout are added with "addWidget()", and "add_widget_count" counts those calls.
 	"""
 
 	def __init__(self, columns_or_rows, flow = HORIZONTAL_FLOW):
@@ -201,12 +467,16 @@ class GListLayout(_ListLayout, QGridLayout):
 		super().__init__()
 		self.columns_or_rows = columns_or_rows
 		self.flow = flow
+		self.add_widget_count = 0
+		self._placed = 0
+		self._taken = {}
 
 	def append(self, item):
-		tup = self._place_widget(item, len(self.items))
-		self.items.append(item)
-		self.sig_len_changed.emit()
-		return tup
+		index = len(self.items)
+		self._items_append(item)
+		self._add_all_from(index)
+		self._len_changed()
+		return self._cell(index)
 
 	def insert(self, index, item):
 		if not 0 <= index <= len(self.items):
@@ -215,20 +485,83 @@ class GListLayout(_ListLayout, QGridLayout):
 			tup = self.append(item)
 		else:
 			self._take_all_from(index)
-			tup = self._place_widget(item, index)
-			self.items.insert(index, item)
-			self._add_all_from(index + 1)
-		self.sig_len_changed.emit()
+			self._items_insert(index, item)
+			self._add_all_from(index)
+			tup = self._cell(index)
+		self._len_changed()
 		return tup
 
 	def remove(self, item):
-		if item not in self.items:
-			raise ValueError('Item not in list layout')
-		index = self.items.index(item)
+		"""
+		Removes the item from the layout. The widget is not deleted, but it is
+		released to the pool if this layout has one.
+		"""
+		index = self._position(item)
 		self._take_all_from(index)
-		del self.items[index]
+		self._items_delete(index)
+		self._taken.pop(item, None)
 		self._add_all_from(index)
-		self.sig_len_changed.emit()
+		if self.pool is not None:
+			self.pool.release(item)
+		self._len_changed()
+
+	def swap(self, item_a, item_b):
+		index_a = self._position(item_a)
+		index_b = self._position(item_b)
+		self._take_all_from(min(index_a, index_b))
+		self._items_swap(index_a, index_b)
+		self._add_all_from(min(index_a, index_b))
+
+	def extend(self, items):
+		"""
+		Appends all the given items, emitting "sig_len_changed" once.
+		"""
+		items = list(items)
+		if not items:
+			return
+		index = len(self.items)
+		self._items_extend(items)
+		self._add_all_from(index)
+		self._len_changed()
+
+	def insert_many(self, index, items):
+		"""
+		Inserts all the given items starting at "index", moving the items after them
+		only once, and emitting "sig_len_changed" once.
+		"""
+		if not 0 <= index <= len(self.items):
+			raise IndexError()
+		items = list(items)
+		if not items:
+			return
+		if index == len(self.items):
+			self.extend(items)
+			return
+		self._take_all_from(index)
+		self._items_insert_many(index, items)
+		self._add_all_from(index)
+		self._len_changed()
+
+	def remove_many(self, items):
+		"""
+		Removes all the given items from the layout, moving the items after them only
+		once, and emitting "sig_len_changed" once. An item given more than once is
+		removed once.
+		"""
+		items = list(dict.fromkeys(items))
+		if not items:
+			return
+		indexes = self._positions_of(items)
+		first = min(indexes)
+		self._take_all_from(first)
+		self._items_delete_many(indexes)
+		for item in items:
+			self._taken.pop(item, None)
+		self._add_all_from(first)
+		if self.pool is not None:
+			for item in items:
+				self.pool.release(item)
+		self._len_changed()
 
 	def set_columns(self, columns):
 		if columns != self.columns_or_rows or self.flow != HORIZONTAL_FLOW:
@@ -236,7 +569,7 @@ class GListLayout(_ListLayout, QGridLayout):
 			self.columns_or_rows = columns
 			self.flow = HORIZONTAL_FLOW
 			self._add_all_from(0)
-			self.sig_len_changed.emit()
+			self._len_changed()
 
 	def set_rows(self, rows):
 		if rows != self.columns_or_rows or self.flow != VERTICAL_FLOW:
@@ -244,34 +577,66 @@ class GListLayout(_ListLayout, QGridLayout):
 			self.columns_or_rows = rows
 			self.flow = VERTICAL_FLOW
 			self._add_all_from(0)
-			self.sig_len_changed.emit()
+			self._len_changed()
 
-	def _place_widget(self, item, index):
+	def clear(self):
+		super().clear()
+		self._placed = 0
+		# The widgets of the QLayoutItems taken while deferring were discarded above.
+		self._taken.clear()
+
+	def _cell(self, index):
 		"""
-		Puts the given widget in the correct cell for the given index
+		Returns the (row, column) of the cell for the given index
 		"""
 		if self.flow == HORIZONTAL_FLOW:
 			row = index // self.columns_or_rows
-			column = index - row * self.columns_or_rows
+			return row, index - row * self.columns_or_rows
+		column = index // self.columns_or_rows
+		return index - column * self.columns_or_rows, column
+
+	def _place_widget(self, item, index):
+		"""
+		Puts the given widget in the correct cell for the given index
+		"""
+		row, column = self._cell(index)
+		if layout_item := self._taken.pop(item, None):
+			self.addItem(layout_item, row, column)
 		else:
-			column = index // self.columns_or_rows
-			row = index - column * self.columns_or_rows
-		self.addWidget(item, row, column)
+			self.addWidget(item, row, column)
+			self.add_widget_count += 1
 		return row, column
 
 	def _add_all_from(self, index):
 		"""
 		Puts items in the list back into the layout after insert / other.
+
+		While updates are deferred, this does nothing; the items are put back when
+		the outermost DeferredUpdates context exits.
 		"""
+		if self._deferring:
+			return
 		for iter_index in range(index, len(self.items)):
 			self._place_widget(self.items[iter_index], iter_index)
+		self._placed = len(self.items)
 
 	def _take_all_from(self, index):
 		"""
 		Takes items from the layout but leaves them in the list.
+
+		Only the items which are currently placed in the layout are taken, so that
+		repeated calls while updates are deferred do not repeat work. The taken
+		QLayoutItems are kept, to be put back in their new cells by "_place_widget()".
+		Taking from the end of the layout, Qt does not need to shift its item list, so
+		this costs O(k) for the last k items.
 		"""
-		for iter_index in reversed(range(index, len(self.items))):
-			self.takeAt(iter_index)
+		for iter_index in reversed(range(index, self._placed)):
+			layout_item = self.takeAt(iter_index)
+			self._taken[layout_item.widget()] = layout_item
+		self._placed = min(self._placed, index)
+
+	def _apply_deferred(self):
+		self._add_all_from(self._placed)
 
 
 class ColumnListLayout(QGridLayout, _ListLinearLayout):
@@ -279,63 +644,261 @@ class ColumnListLayout(QGridLayout, _ListLinearLayout):
 	Extends QGridLayout to allow for arranging items in columns which wrap
 	automatically according to the item's sizeHint.
 
-	You must call "reflow()" on your instance of this class if the container which
-	uses this layout resizes, or else contained widgets may be squeezed.
+	When the container which uses this layout resizes, the layout reflows itself
+	"reflow_delay" milliseconds after the last change of its geometry, so that a
+	burst of resize events (as when dragging the edge of a window) results in only
+	one reflow. If the number of columns (or rows) would stay the same, nothing is
+	moved. Items added before the layout has a geometry are placed as soon as it
+	gets one, without waiting. So that the container can shrink, the minimum size
+	of this layout in the flow direction is that of its largest item.
+
+	With "packing = BALANCED_PACKING", items are not aligned in columns. Instead,
+	each row (or column, with VERTICAL_FLOW) holds as many items as fit, and the
+	breaks between rows are chosen so that the rows are filled as evenly as
+	possible, using as few rows as possible. See "balanced_flow_scenario()".
+
+	Pass "reflow_delay = None" to turn this off; you must then call "reflow()" on
+	your instance of this class if the container which uses this layout resizes,
+	or else contained widgets may be squeezed.
+
+	The sizeHint of each widget is cached until this layout is invalidated, so that
+	a burst of appends or inserts, or a resize which leaves the number of columns
+	(or rows) as it was, does not measure every widget again. A widget's cached
+	sizeHint is dropped when it gets a LayoutRequest, FontChange or StyleChange
+	event, and the whole cache is dropped whenever this layout is invalidated other
+	than by the changes made when reflowing, e.g. when a widget in it calls
+	"updateGeometry()" (as a QLabel does when its text is changed). That includes
+	the invalidation Qt makes when it activates the layout after a reflow has moved
+	items, so the first reflow after the number of columns changes measures every
+	widget again.
 	"""
 
-	def __init__(self, flow = HORIZONTAL_FLOW, end_space = False):
+	HINT_EVENTS = (QEvent.LayoutRequest, QEvent.FontChange, QEvent.StyleChange)
+
+	def __init__(self, flow = HORIZONTAL_FLOW, end_space = False, *,
+		reflow_delay = 50, packing = GRID_PACKING):
 		"""
 		"flow" determines whether to add items left-to-right, or top-to-bottom. If you
 		want to add items left-to-right, use HORIZONTAL_FLOW, If you want to add items
 		top-to-bottom, use VERTICAL_FLOW,
+
+		"packing" is GRID_PACKING to align the items in columns (or rows), or
+		BALANCED_PACKING to break the items into evenly filled rows (or columns).
+
+		"reflow_delay" is the time in milliseconds to wait after the geometry of this
+		layout changes before reflowing, or None to only reflow when told to.
 		"""
 		super().__init__()
 		self.flow = flow
 		self.end_space = end_space
 		self.height = None
 		self.width = None
+		self.reflow_delay = reflow_delay
+		self.packing = packing
+		self.last_moved_count = 0
+		self._x_axis_len = None
+		self._cells = {}
+		self._spacer = None
+		self._lines = []
+		self._reflow_timer = QTimer(self)
+		self._reflow_timer.setSingleShot(True)
+		self._reflow_timer.timeout.connect(self._auto_reflow)
+		self._reflow_pending = False
+		self._reflowing = False
+		self._size_hints = {}
 
 	def reflow(self, *, height = None, width = None):
 		"""
 		Calculates number of columns or rows needed and reorders accordingly.
+
+		Only widgets whose cell changes are moved. Returns the number of widgets
+		moved, which is also kept in "last_moved_count".
 		"""
 		if height:
 			self.height = height
 		if width:
 			self.width = width
+		if self._deferring:
+			self._reflow_pending = True
+			return 0
 		if len(self.items) == 0:
+			return 0
+		if self.reflow_delay is not None and self._container_size() is None:
+			return 0	# Will reflow when the geometry of this layout is set.
+		return self._place(self._flow_scenario())
+
+	def setGeometry(self, rect):
+		if self.reflow_delay is not None:
+			margins = self.contentsMargins()
+			contents = rect.adjusted(margins.left(), margins.top(), -margins.right(), -margins.bottom())
+			if self.flow == HORIZONTAL_FLOW:
+				changed = contents.width() != self.width
+				self.width = contents.width()
+			else:
+				changed = contents.height() != self.height
+				self.height = contents.height()
+			if changed:
+				if self._x_axis_len is None:
+					# Nothing is placed yet, so place the items before laying out the grid
+					# rather than leaving them unmanaged until the timer fires.
+					self._reflow_timer.stop()
+					self._auto_reflow()
+				else:
+					self._reflow_timer.start(self.reflow_delay)
+		super().setGeometry(rect)
+
+	def minimumSize(self):
+		size = super().minimumSize()
+		if self.reflow_delay is None or not self.items:
+			return size
+		margins = self.contentsMargins()
+		if self.flow == HORIZONTAL_FLOW:
+			size.setWidth(margins.left() + margins.right() +
+				max(self._size_hint(item).width() for item in self.items))
+		else:
+			size.setHeight(margins.top() + margins.bottom() +
+				max(self._size_hint(item).height() for item in self.items))
+		return size
+
+	def _auto_reflow(self):
+		"""
+		Called by the reflow timer. Does nothing if the number of columns (or rows)
+		would be unchanged.
+		"""
+		if self._deferring:
+			self._reflow_pending = True
 			return
+		if not self.items:
+			return
+		flow_scenario = self._flow_scenario()
+		if self.packing == BALANCED_PACKING or flow_scenario.x_axis_len != self._x_axis_len:
+			self._place(flow_scenario)
+
+	def _container_size(self):
+		return self.width if self.flow == HORIZONTAL_FLOW else self.height
+
+	def _flow_scenario(self):
+		engine = balanced_flow_scenario if self.packing == BALANCED_PACKING else best_flow_scenario
 		if self.flow == HORIZONTAL_FLOW:
 			if self.width is None:
 				raise RuntimeError('Cannot reflow with unknown width')
-			widget_widths = [ item.sizeHint().width() for item in self.items ]
-			flow_scenario = best_flow_scenario(widget_widths, self.width, self.spacing())
-			while item := self.takeAt(0):
-				pass
-			for row, items in enumerate(flow_scenario.partition(self.items)):
-				for col, item in enumerate(items):
-					self.addWidget(item, row, col)
-			if self.end_space:
-				self.addItem(QSpacerItem(0, 0, QSizePolicy.MinimumExpanding, QSizePolicy.Preferred),
-					0, self.columnCount(), self.rowCount() - 1, 1)
+			widget_widths = [ self._size_hint(item).width() for item in self.items ]
+			return engine(widget_widths, self.width, self.spacing())
+		if self.height is None:
+			raise RuntimeError('Cannot reflow with unknown height')
+		widget_heights = [ self._size_hint(item).height() for item in self.items ]
+		return engine(widget_heights, self.height, self.spacing())
+
+	def _place(self, flow_scenario):
+		"""
+		Puts the items in their cells according to the given FlowScenario, moving only
+		the widgets whose cell changed. Returns the number of widgets moved.
+		"""
+		lines = flow_scenario.partition(self.items)
+		cells = {}
+		for y_axis, items in enumerate(lines):
+			for x_axis, item in enumerate(items):
+				cells[item] = (x_axis, y_axis) \
+					if self.flow == VERTICAL_FLOW and self.packing == GRID_PACKING \
+					else (y_axis, x_axis)
+		moved = [ item for item in self.items if self._cells.get(item) != cells[item] ]
+		self._cells = cells
+		self._x_axis_len = flow_scenario.x_axis_len
+		self.last_moved_count = len(moved)
+		if not moved:
+			return 0
+		self._reflowing = True
+		try:
+			if self.packing == BALANCED_PACKING:
+				self._place_lines(lines)
+			else:
+				self._place_cells(moved, cells)
+		finally:
+			self._reflowing = False
+		return self.last_moved_count
+
+	def _place_cells(self, moved, cells):
+		"""
+		Moves the given widgets to their (row, column) in "cells".
+		"""
+		if len(moved) > len(self.items) // 2:
+			# Cheaper to take everything out than to look up each moved widget.
+			taken = {}
+			for index in reversed(range(self.count())):
+				layout_item = self.takeAt(index)
+				if widget := layout_item.widget():
+					taken[widget] = layout_item
+			self._spacer = None
+			moved = self.items
 		else:
-			if self.height is None:
-				raise RuntimeError('Cannot reflow with unknown height')
-			widget_heights = [ item.sizeHint().height() for item in self.items ]
-			flow_scenario = best_flow_scenario(widget_heights, self.height, self.spacing())
-			while item := self.takeAt(0):
-				pass
-			for col, items in enumerate(flow_scenario.partition(self.items)):
-				for row, item in enumerate(items):
-					self.addWidget(item, row, col)
+			taken = {}
+			for item in moved:
+				if (index := self.indexOf(item)) >= 0:
+					taken[item] = self.takeAt(index)
+			if self._spacer is not None:
+				self.takeAt(self.indexOf(self._spacer))
+				self._spacer = None
+		for item in moved:
+			row, col = cells[item]
+			if layout_item := taken.get(item):
+				self.addItem(layout_item, row, col)
+			else:
+				self.addWidget(item, row, col)
+		if self.end_space:
+			if self.flow == HORIZONTAL_FLOW:
+				self._spacer = QSpacerItem(0, 0, QSizePolicy.MinimumExpanding, QSizePolicy.Preferred)
+				self.addItem(self._spacer, 0, self.columnCount(), self.rowCount() - 1, 1)
+			else:
+				self._spacer = QSpacerItem(0, 0, QSizePolicy.Preferred, QSizePolicy.MinimumExpanding)
+				self.addItem(self._spacer, self.rowCount(), 0, 1, self.columnCount() - 1)
+
+	def _place_lines(self, lines):
+		"""
+		Puts each line of items in a box layout of its own, in the first column (or
+		row) of the grid. Only the lines whose items changed are filled again.
+		"""
+		changed = [
+			index for index, line in enumerate(lines)
+			if index >= len(self._lines) or self._lines[index][1] != line
+		]
+		taken = {}
+		for index in changed + list(range(len(lines), len(self._lines))):
+			if index < len(self._lines):
+				box = self._lines[index][0]
+				while layout_item := box.takeAt(0):
+					if widget := layout_item.widget():
+						taken[widget] = layout_item
+		for box, _ in self._lines[len(lines):]:
+			self.takeAt(self.indexOf(box))
+			box.deleteLater()
+		del self._lines[len(lines):]
+		for index in changed:
+			if index == len(self._lines):
+				box = QHBoxLayout() if self.flow == HORIZONTAL_FLOW else QVBoxLayout()
+				box.setContentsMargins(0, 0, 0, 0)
+				box.setSpacing(self.spacing())
+				if self.flow == HORIZONTAL_FLOW:
+					self.addLayout(box, index, 0)
+				else:
+					self.addLayout(box, 0, index)
+				self._lines.append([box, None])
+			box = self._lines[index][0]
+			for item in lines[index]:
+				if layout_item := taken.get(item):
+					box.addItem(layout_item)
+				else:
+					box.addWidget(item)
 			if self.end_space:
-				self.addItem(QSpacerItem(0, 0, QSizePolicy.Preferred, QSizePolicy.MinimumExpanding),
-					self.rowCount(), 0, 1, self.columnCount() - 1)
+				box.addStretch()
+			self._lines[index][1] = lines[index]
+		# Changes inside the line layouts do not reach the container by themselves,
+		# and addLayout() does not invalidate.
+		self.invalidate()
 
 	def append(self, item):
-		self.items.append(item)
+		self._items_append(item)
 		self.reflow()
-		self.sig_len_changed.emit()
+		self._len_changed()
 
 	def insert(self, index, item):
 		if not 0 <= index <= len(self.items):
@@ -343,21 +906,100 @@ class ColumnListLayout(QGridLayout, _ListLinearLayout):
 		if index == len(self.items):
 			self.append(item)
 		else:
-			self.items.insert(index, item)
+			self._items_insert(index, item)
 		self.reflow()
-		self.sig_len_changed.emit()
+		self._len_changed()
 
 	def remove(self, item):
 		super().remove(item)
+		self._forget(item)
+		self.reflow()
+
+	def extend(self, items):
+		"""
+		Appends all the given items, with a single reflow.
+		"""
+		items = list(items)
+		if not items:
+			return
+		self._items_extend(items)
+		self.reflow()
+		self._len_changed()
+
+	def insert_many(self, index, items):
+		"""
+		Inserts all the given items starting at "index", with a single reflow.
+		"""
+		if not 0 <= index <= len(self.items):
+			raise IndexError()
+		items = list(items)
+		if not items:
+			return
+		self._items_insert_many(index, items)
 		self.reflow()
+		self._len_changed()
+
+	def remove_many(self, items):
+		items = list(dict.fromkeys(items))
+		super().remove_many(items)
+		for item in items:
+			self._forget(item)
+		self.reflow()
+
+	def clear(self):
+		"""
+		Clears (and deletes, or releases to the pool) all the widgets in the list,
+		including those not placed in the grid yet.
+		"""
+		if self._lines:
+			self._place_lines([])
+		for item in self.items:
+			self._forget(item)
+		super().clear()
+		self._spacer = None
+		self._x_axis_len = None
+
+	def removeWidget(self, widget):
+		if self._lines and (cell := self._cells.get(widget)):
+			self._lines[cell[0]][0].removeWidget(widget)
+		else:
+			super().removeWidget(widget)
+
+	def invalidate(self):
+		# Only the invalidations made while placing items are known to leave the size
+		# hints as they were. Qt also invalidates this layout when it activates it,
+		# but a nested layout learns of its widgets' changes only that way, so that
+		# invalidation cannot be told apart from one which matters.
+		if not self._reflowing:
+			self._size_hints = {}
+		super().invalidate()
+
+	def eventFilter(self, obj, event):
+		if event.type() in self.HINT_EVENTS:
+			self._size_hints.pop(obj, None)
+		return False
+
+	def _size_hint(self, item):
+		"""
+		Returns the (cached) sizeHint of the given widget.
+		"""
+		if (size := self._size_hints.get(item)) is None:
+			size = self._size_hints[item] = item.sizeHint()
+			item.installEventFilter(self)
+		return size
+
+	def _forget(self, item):
+		self._size_hints.pop(item, None)
+		self._cells.pop(item, None)
+		item.removeEventFilter(self)
+
+	def _apply_deferred(self):
+		if self._reflow_pending:
+			self._reflow_pending = False
+			self.reflow()
 
 	def swap(self, item_a, item_b):
-		if not item_a in self.items or not item_b in self.items:
-			raise ValueError("Item not in list layout")
-		index_a = self.items.index(item_a)
-		index_b = self.items.index(item_b)
-		self.items[index_a] = item_b
-		self.items[index_b] = item_a
+		self._items_swap(self._position(item_a), self._position(item_b))
 		self.reflow()
 
 
@@ -369,16 +1011,14 @@ class FlowScenario:
 
 	def __init__(self, widget_sizes, spacing, x_axis_count):
 		self.spacing = spacing
+		self.widget_sizes = widget_sizes
 		self.x_axis_len = x_axis_count
 		self.y_axis_len = ceil(len(widget_sizes) / self.x_axis_len)
-		self.y_axis_list = self.partition(widget_sizes)
-		self.x_axis_sizes = [
-			max(
-				self.y_axis_list[i][x_axis] if x_axis < len(self.y_axis_list[i]) else 0
-				for i in range(self.y_axis_len)
-			)
-			for x_axis in range(self.x_axis_len)
-		]
+		self.x_axis_sizes = column_maxima(widget_sizes, x_axis_count)
+
+	@property
+	def y_axis_list(self):
+		return self.partition(self.widget_sizes)
 
 	def space_needed(self):
 		return sum(self.x_axis_sizes) + self.spacing * (len(self.x_axis_sizes) - 1)
@@ -390,7 +1030,97 @@ class FlowScenario:
 		]
 
 
+class BalancedFlowScenario(FlowScenario):
+	"""
+	Scenario in which each line in the x-axis has its own number of items, given
+	by "line_lengths". Items are not aligned in columns, so "x_axis_sizes" is the
+	size of each line, and "x_axis_len" is the length of the longest line.
+	"""
+
+	def __init__(self, widget_sizes, spacing, line_lengths):	# pylint: disable = super-init-not-called
+		self.spacing = spacing
+		self.widget_sizes = widget_sizes
+		self.line_lengths = line_lengths
+		self.x_axis_len = max(line_lengths, default = 0)
+		self.y_axis_len = len(line_lengths)
+		self.x_axis_sizes = [
+			sum(line) + spacing * (len(line) - 1) for line in self.y_axis_list ]
+
+	def space_needed(self):
+		return max(self.x_axis_sizes, default = 0)
+
+	def partition(self, items):
+		lines = []
+		start = 0
+		for length in self.line_lengths:
+			lines.append(items[start : start + length])
+			start += length
+		return lines
+
+
+def balanced_flow_scenario(widget_sizes, container_size, spacing):
+	"""
+	Returns a BalancedFlowScenario which breaks the given sizes into lines no larger
+	than the container size (except for single items which are larger).
+
+	Breaks are chosen the way Knuth and Plass break paragraphs into lines: by
+	dynamic programming over the break points, with the fewest lines as the first
+	goal, and the smallest sum of squared unused space on every line as the second.
+	This gives as few lines as filling each line in turn would, with the leftover
+	space shared evenly between them, the last line included.
+
+	The fewest lines needed to place the first items never decreases as items are
+	added, so only the earliest break points for a line ending at each item need
+	to be tried, and a line never holds more than what fits in the container, nor
+	more than BALANCED_LINE_LIMIT items.
+	"""
+	item_count = len(widget_sizes)
+	sizes = [ max(size, 0) for size in widget_sizes ]
+	# lines[j], badness[j], breaks[j]: the best placement of the first j items.
+	lines = [0] * (item_count + 1)
+	badness = [0] * (item_count + 1)
+	breaks = [0] * (item_count + 1)
+	start = 0
+	line_size = -spacing
+	for end in range(1, item_count + 1):
+		line_size += sizes[end - 1] + spacing
+		while end - start > 1 and (line_size > container_size or end - start > BALANCED_LINE_LIMIT):
+			line_size -= sizes[start] + spacing
+			start += 1
+		fewest_lines = lines[start]
+		best_badness = None
+		trial_size = line_size
+		for line_start in range(start, end):
+			if lines[line_start] != fewest_lines:
+				break
+			trial_badness = badness[line_start]
+			if trial_size < container_size:
+				trial_badness += (container_size - trial_size) ** 2
+			if best_badness is None or trial_badness < best_badness:
+				best_badness = trial_badness
+				breaks[end] = line_start
+			trial_size -= sizes[line_start] + spacing
+		lines[end] = fewest_lines + 1
+		badness[end] = best_badness
+	line_lengths = []
+	end = item_count
+	while end:
+		line_lengths.append(end - breaks[end])
+		end = breaks[end]
+	line_lengths.reverse()
+	return BalancedFlowScenario(widget_sizes, spacing, line_lengths)
+
+
 def best_flow_scenario(widget_sizes, container_size, spacing):
+	"""
+	Returns the FlowScenario with the greatest number of items in the x-axis which
+	fits in the given container size.
+
+	Starts from the number of items which fit in the first row, and counts down.
+	Each candidate count is tested by "scenario_fits()", which stops as soon as the
+	column widths add up to more than the container size, so a FlowScenario is only
+	constructed for the result.
+	"""
 	x_axis_count = 1
 	cumulative_size = 0
 	for widget_size in widget_sizes:
@@ -399,13 +1129,63 @@ def best_flow_scenario(widget_sizes, container_size, spacing):
 			break
 		cumulative_size += spacing
 		x_axis_count += 1
-	flow_scenario = None
-	while x_axis_count > 1:
-		flow_scenario = FlowScenario(widget_sizes, spacing, x_axis_count)
-		if flow_scenario.space_needed() <= container_size:
-			break
-		x_axis_count -= 1
-	return flow_scenario or FlowScenario(widget_sizes, spacing, 1)
+	if x_axis_count == 1:
+		return FlowScenario(widget_sizes, spacing, 1)
+	for count in range(x_axis_count, 1, -1):
+		if scenario_fits(widget_sizes, spacing, count, container_size):
+			return FlowScenario(widget_sizes, spacing, count)
+	# None fit; the smallest count tried (2) is used, as it always has been.
+	return FlowScenario(widget_sizes, spacing, 2)
+
+
+def scenario_fits(widget_sizes, spacing, x_axis_count, container_size):
+	"""
+	Returns True if FlowScenario(widget_sizes, spacing, x_axis_count).space_needed()
+	would be no more than container_size, without constructing the FlowScenario.
+	"""
+	budget = container_size - spacing * (x_axis_count - 1)
+	item_count = len(widget_sizes)
+	# Column maxima start with the first row. Columns which are short an item in
+	# the last row include a zero, as in FlowScenario.
+	maxima = list(widget_sizes[:x_axis_count])
+	maxima.extend([0] * (x_axis_count - len(maxima)))
+	if item_count > x_axis_count and item_count % x_axis_count:
+		for x_axis in range(item_count % x_axis_count, x_axis_count):
+			maxima[x_axis] = max(maxima[x_axis], 0)
+	total = sum(maxima)
+	if total > budget:
+		return False
+	# Maxima can only grow from here on, so stop as soon as the total is too big.
+	x_axis = 0
+	for size in widget_sizes[x_axis_count:]:
+		if size > maxima[x_axis]:
+			total += size - maxima[x_axis]
+			if total > budget:
+				return False
+			maxima[x_axis] = size
+		x_axis += 1
+		if x_axis == x_axis_count:
+			x_axis = 0
+	return True
+
+
+def column_maxima(widget_sizes, x_axis_count):
+	"""
+	Returns a list of the largest size in each column when the given sizes are laid
+	out in rows of "x_axis_count". Columns which are short an item in the last row
+	include a size of zero.
+	"""
+	item_count = len(widget_sizes)
+	# Columns from "short_from" onward have no item in the last row:
+	short_from = item_count % x_axis_count if item_count > x_axis_count else item_count
+	maxima = []
+	for x_axis in range(x_axis_count):
+		column = widget_sizes[x_axis::x_axis_count]
+		if short_from and x_axis >= short_from:
+			maxima.append(max(max(column, default = 0), 0))
+		else:
+			maxima.append(max(column))
+	return maxima
 
 
 #  end qt_extras/qt_extras/list_layout.py
@@ -21,15 +21,39 @@
 Provides the ShuffleGrid class, which extends QGridLayout to allow for moving
 rows up / down and deleting.
 """
-from PyQt5.QtCore import Qt
+from bisect import bisect_left, insort
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QGridLayout
 
 
 class ShuffleGrid(QGridLayout):
 	"""
 	Extends QGridLayout to allow for moving rows up / down, inserting, and deleting.
+
+	Which cells are occupied is kept in a map on the python side, so that queries
+	such as "row_is_empty" do not need to ask Qt about every cell. The map is kept
+	up to date by the methods of this class, and built again from the layout on
+	first use after items are added, taken or replaced using the QGridLayout
+	functions.
+
+	Items which span several columns keep their span when rows are moved. Items
+	which span several rows are not supported by the methods which move rows.
+
+	Deleting rows leaves empty rows behind. Call "compact()" to renumber the rows
+	without gaps, or pass "auto_compact" to have that done by "delete_row()"
+	whenever there are more than that many empty rows between inhabited rows.
+	"sig_compacted" is emitted with the mapping of old to new row numbers each
+	time rows are renumbered.
 	"""
 
+	sig_compacted = pyqtSignal(dict)
+
+	def __init__(self, *args, auto_compact = None):
+		super().__init__(*args)
+		self.auto_compact = auto_compact
+		self._cells = None			# {row: {column: QLayoutItem}}
+		self._inhabited = None		# sorted list of the rows in _cells
+
 	def __iter__(self):
 		"""
 		Generator which returns a list of widgets occupying each row on iteration.
@@ -41,6 +65,27 @@ class ShuffleGrid(QGridLayout):
 		for row in self.inhabited_row_indexes():
 			yield self.row(row)
 
+	def addWidget(self, *args, **kwargs):
+		super().addWidget(*args, **kwargs)
+		self._cells = None
+
+	def addItem(self, *args, **kwargs):
+		super().addItem(*args, **kwargs)
+		self._cells = None
+
+	def addLayout(self, *args, **kwargs):
+		super().addLayout(*args, **kwargs)
+		self._cells = None
+
+	def takeAt(self, index):
+		# Also called by Qt when a widget in this layout is removed or deleted.
+		self._cells = None
+		return super().takeAt(index)
+
+	def replaceWidget(self, *args, **kwargs):
+		self._cells = None
+		return super().replaceWidget(*args, **kwargs)
+
 	def row(self, row):
 		"""
 		Returns a list of widgets occupying the given row.
@@ -48,8 +93,8 @@ class ShuffleGrid(QGridLayout):
 		Where there is no widget in a particular column, the list yielded will contain
 		None at that index.
 		"""
-		return [ None if self.itemAtPosition(row, col) is None \
-			else self.itemAtPosition(row, col).widget() \
+		cells = self._occupancy().get(row, {})
+		return [ None if (item := cells.get(col)) is None else item.widget() \
 			for col in range(self.columnCount()) ]
 
 	def column(self, column):
@@ -61,28 +106,28 @@ class ShuffleGrid(QGridLayout):
 		will be the same as the number of INHABITED rows (rows that are completely
 		empty are skipped).
 		"""
-		return [ None if self.itemAtPosition(row, column) is None \
-			else self.itemAtPosition(row, column).widget() \
-			for row in self.inhabited_row_indexes() ]
+		occupancy = self._occupancy()
+		return [ None if (item := occupancy[row].get(column)) is None else item.widget() \
+			for row in self._inhabited ]
 
 	def row_is_empty(self, row):
 		"""
 		Returns True if given row has no items (used for skipping empty rows).
 		"""
-		return all(self.itemAtPosition(row, col) is None \
-			for col in range(self.columnCount()))
+		return row not in self._occupancy()
 
 	def inhabited_row_count(self):
 		"""
 		Returns the count of rows which are inhabited with at least one item.
 		"""
-		return self.rowCount() - sum(self.row_is_empty(row) for row in range(self.rowCount()))
+		return len(self._occupancy())
 
 	def inhabited_row_indexes(self):
 		"""
 		Returns a list of row indexes for rows which are inhabited with at least one item.
 		"""
-		return [row for row in range(self.rowCount()) if not self.row_is_empty(row)]
+		self._occupancy()
+		return list(self._inhabited)
 
 	def delete_row(self, row):
 		"""
@@ -92,20 +137,36 @@ class ShuffleGrid(QGridLayout):
 		may include uninhabited rows left over from a row deletion operation - NOT
 		according to ShuffleGrid.inhabited_row_indexes().
 		"""
-		if row < 0 or row >= self.rowCount():
-			raise RuntimeError(f'Cannot delete row {row}')
-		if self.row_is_empty(row):
-			raise ValueError(f'Deletion of empty row {row} has no effect')
-		for col in range(self.columnCount()):
-			item = self.itemAtPosition(row, col)
-			if not item is None:
-				index = self.indexOf(item)
-				self.takeAt(index)
-				widget = item.widget()
-				if not widget is None:
-					widget.setParent(None)
-					widget.deleteLater()
+		self.delete_rows([row])
+
+	def delete_rows(self, rows):
+		"""
+		Delete the items on all the given rows, invalidating the layout once.
+
+		As with "delete_row()", the rows are left empty. When there are many items to
+		delete, they are taken out of the layout in one pass over it, rather than
+		looking each of them up. Most of the time is spent by Qt, which scans the layout
+		as each widget is reparented, either way.
+		"""
+		rows = sorted(set(rows))
+		for row in rows:
+			if row < 0 or row >= self.rowCount():
+				raise RuntimeError(f'Cannot delete row {row}')
+			if self.row_is_empty(row):
+				raise ValueError(f'Deletion of empty row {row} has no effect')
+		# One pass over the layout costs about as much as looking up a hundred items.
+		if sum(len(self._cells[row]) for row in rows) > 100:
+			taken = self._take_rows(rows)
+		else:
+			taken = [ item for row in rows for item, _ in self._take_row(row).values() ]
+		for item in taken:
+			widget = item.widget()
+			if not widget is None:
+				widget.setParent(None)
+				widget.deleteLater()
 		self.invalidate()
+		if self.auto_compact is not None and self.empty_row_count() > self.auto_compact:
+			self.compact()
 
 	def insert_row(self, widgets, row):
 		"""
@@ -115,22 +176,50 @@ class ShuffleGrid(QGridLayout):
 		may include uninhabited rows left over from a row deletion operation - NOT
 		according to ShuffleGrid.inhabited_row_indexes().
 		"""
+		self.insert_rows([widgets], row)
+
+	def insert_rows(self, rows, row):
+		"""
+		Insert each of the given lists of widgets as a row, starting at the given row.
+
+		If the rows to be filled are empty, no other rows move. Otherwise, every
+		inhabited row from the given row on moves down by the number of rows inserted,
+		and each of their items is moved only once.
+		"""
 		if self.rowCount() < 2:
 			raise RuntimeError('Cannot insert row - grid only has one row')
 		if row < 0 or row >= self.rowCount():
 			raise RuntimeError(f'Cannot insert row at {row}')
-		if not self.row_is_empty(row):
-			for iter_row in range(self.rowCount() - 1, row - 1, -1):
-				if self.row_is_empty(iter_row):
-					continue
-				for col in range(self.columnCount()):
-					item = self.itemAtPosition(iter_row, col)
-					if not item is None:
-						index = self.indexOf(item)
-						self.takeAt(index)
-						self.addItem(item, iter_row + 1, col)
-		for col, widget in enumerate(widgets):
-			self.addWidget(widget, row, col)
+		rows = list(rows)
+		self._make_room(row, len(rows))
+		for new_row, widgets in enumerate(rows, row):
+			for col, widget in enumerate(widgets):
+				super().addWidget(widget, new_row, col)
+				self._put_cell(self.itemAtPosition(new_row, col), new_row, col)
+		self.invalidate()
+
+	def move_rows(self, src_rows, dest):
+		"""
+		Move the given rows, in the order given, so that they start at row "dest".
+
+		The rows are taken out first, leaving their rows empty. Then they are put back
+		in as with "insert_rows()": if the rows from "dest" are empty, they are filled,
+		otherwise every inhabited row from "dest" on moves down to make room.
+
+		Raises ValueError if any of the given rows is empty.
+		"""
+		src_rows = list(src_rows)
+		if len(set(src_rows)) != len(src_rows):
+			raise ValueError('Cannot move a row more than once')
+		if dest < 0 or dest > self.rowCount():
+			raise RuntimeError(f'Cannot move rows to {dest}')
+		for row in src_rows:
+			if self.row_is_empty(row):
+				raise ValueError(f'Cannot move empty row {row}')
+		taken = [ self._take_row(row) for row in src_rows ]
+		self._make_room(dest, len(taken))
+		for new_row, cells in enumerate(taken, dest):
+			self._put_row(cells, new_row)
 		self.invalidate()
 
 	def move_row_up(self, row):
@@ -145,14 +234,10 @@ class ShuffleGrid(QGridLayout):
 		may include uninhabited rows left over from a row deletion operation - NOT
 		according to ShuffleGrid.inhabited_row_indexes().
 		"""
-		valid_indexes = self.inhabited_row_indexes()
-		try:
-			index = valid_indexes.index(row)
-		except ValueError as e:
-			raise ValueError(f'Cannot move empty row {row}') from e
+		index = self._inhabited_index(row)
 		if index == 0:
 			raise IndexError(f'Cannot move first row {row} up')
-		self.swap_rows(row, valid_indexes[index - 1])
+		self.swap_rows(row, self._inhabited[index - 1])
 
 	def move_row_down(self, row):
 		"""
@@ -166,28 +251,195 @@ class ShuffleGrid(QGridLayout):
 		may include uninhabited rows left over from a row deletion operation - NOT
 		according to ShuffleGrid.inhabited_row_indexes().
 		"""
-		valid_indexes = self.inhabited_row_indexes()
-		try:
-			index = valid_indexes.index(row)
-		except ValueError as e:
-			raise ValueError(f'Cannot move empty row {row}') from e
-		if index + 1 == len(valid_indexes):
+		index = self._inhabited_index(row)
+		if index + 1 == len(self._inhabited):
 			raise IndexError(f'Cannot move last row {row} down')
-		self.swap_rows(row, valid_indexes[index + 1])
+		self.swap_rows(row, self._inhabited[index + 1])
 
 	def swap_rows(self, a, b):
 		"""
 		Swap the items in row "a" with the items in row "b".
 		"""
-		for col in range(self.columnCount()):
-			item_a = self.itemAtPosition(a, col)
-			widget_a = item_a.widget()
-			item_b = self.itemAtPosition(b, col)
-			widget_b = item_b.widget()
-			self.takeAt(self.indexOf(item_b))
-			self.replaceWidget(widget_a, widget_b, Qt.FindDirectChildrenOnly)
-			self.addItem(item_a, b, col)
+		occupancy = self._occupancy()
+		taken_a = self._take_row(a) if a in occupancy else None
+		taken_b = self._take_row(b) if b in occupancy else None
+		if taken_a is not None:
+			self._put_row(taken_a, b)
+		if taken_b is not None:
+			self._put_row(taken_b, a)
 		self.invalidate()
 
+	def reorder(self, permutation):
+		"""
+		Rearranges the inhabited rows into the order given by "permutation", which is
+		a list of all the inhabited rows. The rows in "permutation" are put, in turn,
+		into the inhabited rows taken in ascending order, so the set of inhabited row
+		numbers does not change. For example, with rows 0, 1 and 3 inhabited,
+		reorder([3, 0, 1]) moves row 3 to row 0, row 0 to row 1 and row 1 to row 3.
+
+		Each item which moves is taken out and put back once.
+
+		Returns a dict which maps the old row number of each inhabited row to its new
+		row number.
+		"""
+		self._occupancy()
+		permutation = list(permutation)
+		if sorted(permutation) != self._inhabited:
+			raise ValueError('Permutation must list each inhabited row once')
+		mapping = dict(zip(permutation, self._inhabited))
+		taken = { row : self._take_row(row) for row, new_row in mapping.items() if row != new_row }
+		for row, cells in taken.items():
+			self._put_row(cells, mapping[row])
+		if taken:
+			self.invalidate()
+		return mapping
+
+	def sort_rows(self, key, reverse = False):
+		"""
+		Sorts the inhabited rows, as with "reorder()". "key" is called with the list
+		of widgets in each row (as returned by "row()").
+
+		Returns a dict which maps the old row number of each inhabited row to its new
+		row number.
+		"""
+		self._occupancy()
+		return self.reorder(sorted(self._inhabited, key = lambda row: key(self.row(row)),
+			reverse = reverse))
+
+	def empty_row_count(self):
+		"""
+		Returns the number of empty rows before the last inhabited row.
+		"""
+		self._occupancy()
+		return self._inhabited[-1] + 1 - len(self._inhabited) if self._inhabited else 0
+
+	def compact(self):
+		"""
+		Moves the inhabited rows up so that they are numbered from 0 with no empty rows
+		in between, keeping their order.
+
+		Returns a dict which maps the old row number of each inhabited row to its new
+		row number.
+		"""
+		self._occupancy()
+		mapping = { row : new_row for new_row, row in enumerate(self._inhabited) }
+		moved = False
+		for row, new_row in mapping.items():
+			if row != new_row:
+				# Row "new_row" is empty, as any row which was there has moved up already.
+				self._move_row(row, new_row)
+				moved = True
+		self._inhabited = list(range(len(mapping)))
+		if moved:
+			self.invalidate()
+			self.sig_compacted.emit(mapping)
+		return mapping
+
+	def _occupancy(self):
+		"""
+		Returns the map of {row: {column: QLayoutItem}} of the occupied cells, building
+		it from the layout if it is not up to date. An item which spans several cells
+		appears in each of them, as with itemAtPosition().
+		"""
+		if self._cells is None:
+			self._cells = {}
+			for index in range(self.count()):
+				item = self.itemAt(index)
+				row, col, row_span, col_span = self.getItemPosition(index)
+				for span_row in range(row, row + max(row_span, 1)):
+					cells = self._cells.setdefault(span_row, {})
+					for span_col in range(col, col + max(col_span, 1)):
+						cells[span_col] = item
+			self._inhabited = sorted(self._cells)
+		return self._cells
+
+	def _inhabited_index(self, row):
+		"""
+		Returns the position of the given row in the list of inhabited rows.
+		Raises ValueError if the row is empty.
+		"""
+		self._occupancy()
+		index = bisect_left(self._inhabited, row)
+		if index == len(self._inhabited) or self._inhabited[index] != row:
+			raise ValueError(f'Cannot move empty row {row}')
+		return index
+
+	def _make_room(self, row, count):
+		"""
+		Moves every inhabited row from "row" on down by "count" rows, unless the
+		"count" rows starting at "row" are all empty.
+		"""
+		self._occupancy()
+		start = bisect_left(self._inhabited, row)
+		if start == len(self._inhabited) or self._inhabited[start] >= row + count:
+			return
+		for old_row in reversed(self._inhabited[start:]):
+			self._move_row(old_row, old_row + count)
+		self._inhabited[start:] = [ old_row + count for old_row in self._inhabited[start:] ]
+
+	def _move_row(self, row, new_row):
+		"""
+		Moves the items of "row" to "new_row", which must be empty. Does not update
+		the list of inhabited rows.
+		"""
+		cells = self._cells.pop(row)
+		for col, (item, col_span) in self._take_items(cells).items():
+			super().addItem(item, new_row, col, 1, col_span)
+		self._cells[new_row] = cells
+
+	def _take_row(self, row):
+		"""
+		Takes all the items in the given row out of the layout. Returns a dict of
+		{column: (QLayoutItem, column span)}, keyed on the column each item starts in.
+		"""
+		del self._inhabited[bisect_left(self._inhabited, row)]
+		return self._take_items(self._cells.pop(row))
+
+	def _take_rows(self, rows):
+		"""
+		Takes all the items which start in any of the given rows out of the layout, in
+		one pass over the layout from the end, and returns them in a list.
+		"""
+		rows = set(rows)
+		taken = []
+		for index in reversed(range(self.count())):
+			if self.getItemPosition(index)[0] in rows:
+				taken.append(super().takeAt(index))
+		for row in rows:
+			del self._cells[row]
+		self._inhabited = [ row for row in self._inhabited if not row in rows ]
+		return taken
+
+	def _take_items(self, cells):
+		"""
+		Takes each of the items in the given dict of {column: QLayoutItem} out of the
+		layout once, and returns them as "_take_row()" does.
+		"""
+		taken = {}
+		for item in { id(item) : item for item in cells.values() }.values():
+			index = self.indexOf(item)
+			_, col, _, col_span = self.getItemPosition(index)
+			super().takeAt(index)
+			taken[col] = (item, col_span)
+		return taken
+
+	def _put_row(self, taken, row):
+		"""
+		Adds the items taken by "_take_row()" to the given row, which must be empty.
+		"""
+		cells = {}
+		for col, (item, col_span) in taken.items():
+			super().addItem(item, row, col, 1, col_span)
+			for span_col in range(col, col + max(col_span, 1)):
+				cells[span_col] = item
+		self._cells[row] = cells
+		insort(self._inhabited, row)
+
+	def _put_cell(self, item, row, col):
+		if row not in self._cells:
+			self._cells[row] = {}
+			insort(self._inhabited, row)
+		self._cells[row][col] = item
+
 
 #  end qt_extras/shuffle_grid.py
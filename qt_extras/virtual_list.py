@@ -0,0 +1,198 @@
+#  qt_extras/qt_extras/virtual_list.py
+#
+#  Copyright 2026 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+A scrolling list which behaves like a python list of data, and only creates
+widgets for the rows which are visible.
+"""
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QAbstractScrollArea
+from qt_extras.list_layout import _ListLayout
+
+
+class VirtualList(QAbstractScrollArea, _ListLayout):
+	"""
+	A vertical list of rows, one row for each element of a data sequence. Only the
+	rows inside the viewport (plus "overscan" rows above and below) have a widget.
+	When a row scrolls out of view, its widget is hidden and kept in a pool, to be
+	handed to the next row which scrolls into view.
+
+	"factory" is called with the viewport as its only argument, and must return a
+	new row widget. "bind" is called with a row widget and an element of the data,
+	and must make the widget display that element. For example:
+
+		vlist = VirtualList(strings, QLabel, QLabel.setText)
+
+	All rows have the same height. If "row_height" is not given, the sizeHint
+	height of the first widget created is used.
+
+	Like the list layouts, this class supports iteration, len(), indexing,
+	"append", "insert", "remove", "swap", "clear", "batch" and "sig_len_changed".
+	The elements are the data elements, not the widgets. Lookups such as "index",
+	"in" and "remove" compare data elements as a list does (by equality), and find
+	the first occurrence of an element which is in the data more than once.
+	"""
+
+	def __init__(self, data, factory, bind, parent = None, *, row_height = None, overscan = 4):
+		super().__init__(parent)
+		self.factory = factory
+		self.bind = bind
+		self.row_height = row_height
+		self.overscan = overscan
+		self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+		self._visible = {}
+		self._pool = []
+		self._rebind_from = None
+		self._items_extend(list(data))
+		self._refresh()
+
+	def append(self, item):
+		self._items_append(item)
+		self._refresh()
+		self._len_changed()
+
+	def insert(self, index, item):
+		if not 0 <= index <= len(self.items):
+			raise IndexError()
+		self._items_insert(index, item)
+		self._refresh(index)
+		self._len_changed()
+
+	def extend(self, items):
+		items = list(items)
+		if not items:
+			return
+		self._items_extend(items)
+		self._refresh()
+		self._len_changed()
+
+	def remove(self, item):
+		index = self._position(item)
+		self._items_delete(index)
+		self._refresh(index)
+		self._len_changed()
+
+	def swap(self, item_a, item_b):
+		index_a = self._position(item_a)
+		index_b = self._position(item_b)
+		self._items_swap(index_a, index_b)
+		self._refresh(min(index_a, index_b))
+
+	def clear(self):
+		self._items_clear()
+		self._refresh(0)
+		self._len_changed()
+
+	def refresh(self):
+		"""
+		Binds every visible row again. Call this after changing data elements in place.
+		"""
+		self._refresh(0)
+
+	def widget(self, index):
+		"""
+		Returns the widget currently showing the row at the given index, or None if
+		that row is not instantiated.
+		"""
+		return self._visible.get(index)
+
+	def widgets(self):
+		"""
+		Returns a list of the widgets currently instantiated, in row order.
+		"""
+		return [ self._visible[index] for index in sorted(self._visible) ]
+
+	def resizeEvent(self, event):
+		super().resizeEvent(event)
+		self._refresh()
+
+	def scrollContentsBy(self, *_):
+		self._update_rows()
+
+	def _position(self, item):
+		# Data elements may be equal without being the same object, and may repeat,
+		# so the position index, which is keyed on id(), cannot be used.
+		return self.items.index(item)
+
+	def _apply_deferred(self):
+		self._refresh(self._rebind_from)
+
+	def _refresh(self, rebind_from = None):
+		"""
+		Updates the scroll bar range, then the rows. Rows from "rebind_from" onward
+		are bound again, because their data has moved.
+		"""
+		if rebind_from is not None:
+			self._rebind_from = rebind_from if self._rebind_from is None \
+				else min(self._rebind_from, rebind_from)
+		if self._deferring:
+			return
+		if self._rebind_from is not None:
+			for index in [ index for index in self._visible if index >= self._rebind_from ]:
+				self._release(self._visible.pop(index))
+			self._rebind_from = None
+		if self.row_height is None:
+			if not self.items:
+				return
+			self._acquire(0)
+		row_height = self.row_height
+		viewport_height = self.viewport().height()
+		scrollbar = self.verticalScrollBar()
+		scrollbar.setRange(0, max(0, len(self.items) * row_height - viewport_height))
+		scrollbar.setPageStep(viewport_height)
+		scrollbar.setSingleStep(row_height)
+		self._update_rows()
+
+	def _update_rows(self):
+		"""
+		Releases the widgets of rows which scrolled out of view, creates or recycles
+		widgets for rows which scrolled into view, and positions them all.
+		"""
+		if not self.row_height:
+			return
+		offset = self.verticalScrollBar().value()
+		first = max(0, offset // self.row_height - self.overscan)
+		last = min(len(self.items),
+			(offset + self.viewport().height()) // self.row_height + 1 + self.overscan)
+		for index in [ index for index in self._visible if not first <= index < last ]:
+			self._release(self._visible.pop(index))
+		width = self.viewport().width()
+		for index in range(first, last):
+			widget = self._visible.get(index) or self._acquire(index)
+			widget.setGeometry(0, index * self.row_height - offset, width, self.row_height)
+
+	def _acquire(self, index):
+		"""
+		Returns a widget bound to the data at the given index, recycled from the pool
+		if one is available.
+		"""
+		widget = self._pool.pop() if self._pool else self.factory(self.viewport())
+		self.bind(widget, self.items[index])
+		if self.row_height is None:
+			self.row_height = max(1, widget.sizeHint().height())
+		self._visible[index] = widget
+		widget.show()
+		return widget
+
+	def _release(self, widget):
+		widget.hide()
+		self._pool.append(widget)
+
+
+#  end qt_extras/qt_extras/virtual_list.py
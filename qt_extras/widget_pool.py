@@ -0,0 +1,101 @@
+#  qt_extras/qt_extras/widget_pool.py
+#
+#  Copyright 2026 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the WidgetPool class, which keeps removed widgets for reuse instead of
+deleting them.
+"""
+from collections import deque
+
+
+class WidgetPool:
+	"""
+	Keeps hidden widgets, grouped by type, so that they can be reused instead of
+	deleted and constructed again.
+
+	At most "capacity" widgets of each type are kept. When a type's pool is full,
+	the widget which has been in the pool longest is deleted.
+
+		pool = WidgetPool(capacity = 100)
+		layout.pool = pool
+		layout.clear()							# widgets go into the pool
+		row = layout.acquire(Row) or Row(frame)	# reused if there is one
+
+	"""
+
+	def __init__(self, capacity = 64):
+		self.capacity = capacity
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._widgets = {}
+
+	def __len__(self):
+		return sum(len(widgets) for widgets in self._widgets.values())
+
+	def acquire(self, kind):
+		"""
+		Returns a pooled widget of the given type, shown again, or None if there is
+		none.
+		"""
+		widgets = self._widgets.get(kind)
+		if not widgets:
+			self.misses += 1
+			return None
+		self.hits += 1
+		widget = widgets.pop()
+		widget.show()
+		return widget
+
+	def release(self, widget):
+		"""
+		Hides the given widget and keeps it for reuse.
+		"""
+		widget.hide()
+		widgets = self._widgets.setdefault(type(widget), deque())
+		widgets.append(widget)
+		if len(widgets) > self.capacity:
+			widgets.popleft().deleteLater()
+			self.evictions += 1
+
+	def clear(self):
+		"""
+		Deletes all the pooled widgets.
+		"""
+		for widgets in self._widgets.values():
+			for widget in widgets:
+				widget.deleteLater()
+		self._widgets = {}
+
+	def stats(self):
+		"""
+		Returns a dict of the pool's hit, miss and eviction counts, the ratio of hits
+		to acquisitions, and the number of widgets pooled.
+		"""
+		acquisitions = self.hits + self.misses
+		return {
+			'hits'		: self.hits,
+			'misses'	: self.misses,
+			'hit_rate'	: self.hits / acquisitions if acquisitions else 0.0,
+			'evictions'	: self.evictions,
+			'size'		: len(self)
+		}
+
+
+#  end qt_extras/qt_extras/widget_pool.py
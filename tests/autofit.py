@@ -23,7 +23,7 @@ from PyQt5.QtWidgets import QWidget, QMainWindow, QApplication, QShortcut, \
 							QPushButton, QCheckBox, QRadioButton, QLabel, \
 							QLineEdit, QVBoxLayout, QSizePolicy
 from PyQt5.QtGui import QKeySequence
-from qt_extras.autofit import autofit
+from qt_extras.autofit import autofit, AutoFitButton
 
 
 class MainWindow(QMainWindow):
@@ -94,6 +94,11 @@ class MainWindow(QMainWindow):
 		ed.textChanged.connect(w.setText)
 		layout.addWidget(w)
 
+		layout.addWidget(QLabel('AutoFitButton:', self))
+		w = AutoFitButton(self)
+		ed.textChanged.connect(w.setText)
+		layout.addWidget(w)
+
 		layout.addWidget(ed)
 
 		w = QWidget()
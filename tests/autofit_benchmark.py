@@ -0,0 +1,205 @@
+#  qt_extras/tests/autofit_benchmark.py
+#
+#  Copyright 2026 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Times the text shortening functions of the autofit module on long strings
+against the original implementations, checking that both give the same text,
+times resizing many autofitted buttons with and without remembering style
+margins, and compares eliding in Python with Qt's QFontMetrics.elidedText().
+
+Run with:
+
+	QT_QPA_PLATFORM=offscreen python3 tests/autofit_benchmark.py
+
+"""
+from random import choice, seed
+from time import perf_counter
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFontMetrics
+from PyQt5.QtWidgets import QApplication, QLabel, QPushButton, QStyle, QWidget
+from qt_extras import autofit
+from qt_extras.autofit import ELIDE_CHARS, STYLE_OPTION, FontWidths
+
+TEXT_LENGTHS = (100, 500, 2_000)
+WIDTHS = (40, 200, 800)
+BUTTON_COUNT = 500
+RESIZE_ROUNDS = 20
+
+
+def timed(label, func, *args):
+	start = perf_counter()
+	result = func(*args)
+	print(f'  {label:40s} {perf_counter() - start:9.4f}s')
+	return result
+
+
+def original_elide(metrics, text, available):
+	"""
+	The loop used by "elided_text()" before the binary search, kept here for
+	comparison.
+	"""
+	elide_width = metrics.boundingRect(ELIDE_CHARS).width()
+	elide_chars = ''
+	while len(text) > 1 and (metrics.boundingRect(text).width() + elide_width) > available:
+		text = text[:-1]
+		elide_chars = ELIDE_CHARS
+	return text + elide_chars
+
+
+ORIGINAL_KEEPERS = list("bcdfghjklmnpqrstvwxyzBCDFGHJKLMNPQRSTVWXYZ0123456789")
+
+def original_abbreviate(metrics, text, available):
+	"""
+	The loop used by "abbreviated_text()" before the removal plan, kept here for
+	comparison.
+	"""
+	remove_front = True
+	while len(text) > 1 and metrics.boundingRect(text).width() > available:
+		mid = len(text) // 2
+		pop = None
+		if remove_front:
+			for i in range(mid, 0, -1):
+				if not text[i] in ORIGINAL_KEEPERS:
+					pop = i
+					break
+		else:
+			for i in range(mid, len(text)):
+				if not text[i] in ORIGINAL_KEEPERS:
+					pop = i
+					break
+		if pop is None:
+			pop = mid
+		text = text[:pop] + text[pop + 1:]
+		remove_front = not remove_front
+	return text
+
+
+def original_available_width(widget):
+	"""
+	"available_width()" before style margins were remembered, asking the style on
+	every call, kept here for comparison.
+	"""
+	if isinstance(widget, QLabel):
+		return widget.width() - 2
+	return widget.width() + widget.style().subElementRect(
+		QStyle.SE_PushButtonContents, STYLE_OPTION, widget).width()
+
+
+def random_text(length):
+	return ''.join(choice('abcdefghijklmnopqrstuvwxyz ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.,')
+		for _ in range(length))
+
+
+def shorten_all(func, metrics, texts):
+	return [ func(metrics, text, width) for text in texts for width in WIDTHS ]
+
+
+def font_widths(font):
+	return FontWidths(font, 4096)
+
+
+def bench_elide():
+	print(f'Elide text to widths {WIDTHS}:')
+	font = QLabel().font()
+	metrics = QFontMetrics(font)
+	current_elide = getattr(autofit, '__elide')
+	seed(1)
+	for length in TEXT_LENGTHS:
+		texts = [ random_text(length) for _ in range(5) ]
+		original = timed(f'{length} characters, original', shorten_all, original_elide, metrics, texts)
+		current = timed(f'{length} characters, binary search', shorten_all, current_elide, font_widths(font), texts)
+		assert original == current
+
+def bench_abbreviate():
+	print(f'Abbreviate text to widths {WIDTHS}:')
+	font = QLabel().font()
+	metrics = QFontMetrics(font)
+	current_abbreviate = getattr(autofit, '__abbreviate')
+	seed(2)
+	for length in TEXT_LENGTHS:
+		texts = [ random_text(length) for _ in range(2) ]
+		original = timed(f'{length} characters, original', shorten_all, original_abbreviate, metrics, texts)
+		current = timed(f'{length} characters, removal plan', shorten_all, current_abbreviate, font_widths(font), texts)
+		assert original == current
+
+def resize_buttons(buttons):
+	for width in range(RESIZE_ROUNDS):
+		for button in buttons:
+			button.resize(100 + 10 * width, 30)
+	return [ button.text() for button in buttons ]
+
+def bench_resize():
+	print(f'Resize {BUTTON_COUNT} autofitted buttons {RESIZE_ROUNDS} times:')
+	current_available_width = autofit.available_width
+	seed(3)
+	captions = [ random_text(30) for _ in range(10) ]
+	texts = [ captions[index % len(captions)] for index in range(BUTTON_COUNT) ]
+	results = []
+	for label, func in (('original', original_available_width), ('margin remembered', current_available_width)):
+		autofit.available_width = func
+		container = QWidget()
+		buttons = []
+		for text in texts:
+			button = QPushButton(container)
+			autofit.autofit(button)
+			button.setText(text)
+			buttons.append(button)
+		container.show()
+		results.append(timed(label, resize_buttons, buttons))
+		container.deleteLater()
+	autofit.available_width = current_available_width
+	assert results[0] == results[1]
+
+def bench_native_elide():
+	"""
+	Qt marks the elided part with "…" rather than ELIDE_CHARS, and measures text
+	differently, so the results are not expected to be the same. Instead, counts
+	how often both keep the same characters when eliding on the right, and how
+	often the text elided by Qt is wider than the width asked for.
+	"""
+	print(f'Elide text to widths {WIDTHS}, Python against Qt:')
+	font = QLabel().font()
+	metrics = QFontMetrics(font)
+	current_elide = getattr(autofit, '__elide')
+	seed(4)
+	for length in TEXT_LENGTHS:
+		texts = [ random_text(length) for _ in range(50) ]
+		python = timed(f'{length} characters, Python', shorten_all, current_elide, font_widths(font), texts)
+		for mode, name in ((Qt.ElideRight, 'right'), (Qt.ElideMiddle, 'middle'), (Qt.ElideLeft, 'left')):
+			native = timed(f'{length} characters, Qt, {name}', shorten_all,
+				lambda metrics, text, width: metrics.elidedText(text, mode, width), metrics, texts)
+			overflows = [ metrics.boundingRect(text).width() - width
+				for text, width in zip(native, WIDTHS * len(texts))
+				if metrics.boundingRect(text).width() > width ]
+			if overflows:
+				print(f'    {len(overflows)} of {len(native)} too wide, by at most {max(overflows)} pixels')
+			if mode == Qt.ElideRight:
+				same = sum(a.rstrip('.') == b.rstrip('…') for a, b in zip(python, native))
+		print(f'  same characters kept on the right: {same} of {len(python)}')
+
+
+if __name__ == "__main__":
+	app = QApplication([])
+	bench_elide()
+	bench_abbreviate()
+	bench_resize()
+	bench_native_elide()
+
+
+#  end qt_extras/tests/autofit_benchmark.py
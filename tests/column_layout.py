@@ -73,10 +73,6 @@ class MainWindow(QMainWindow):
 
 		lo.addStretch()
 
-
-	def resizeEvent(self, event):
-		self.list.reflow(width = self.width())
-
 	@pyqtSlot()
 	def slot_add_widget(self):
 		self.list.append(Thing(self))
@@ -0,0 +1,155 @@
+#  qt_extras/tests/column_layout_benchmark.py
+#
+#  Copyright 2026 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Compares the ColumnListLayout flow calculations against the original search,
+checking that both give the same results, and compares the balanced flow with
+the grid flow for speed and packing density.
+
+Run with:
+
+	python3 tests/column_layout_benchmark.py
+
+"""
+from math import ceil
+from random import randint, seed
+from time import perf_counter
+from qt_extras.list_layout import best_flow_scenario, balanced_flow_scenario
+
+CONTAINER_SIZE = 1920
+SPACING = 6
+
+
+class OriginalFlowScenario:
+	"""
+	FlowScenario as it was before "column_maxima()", kept here for comparison.
+	"""
+
+	def __init__(self, widget_sizes, spacing, x_axis_count):
+		self.spacing = spacing
+		self.x_axis_len = x_axis_count
+		self.y_axis_len = ceil(len(widget_sizes) / self.x_axis_len)
+		self.y_axis_list = self.partition(widget_sizes)
+		self.x_axis_sizes = [
+			max(
+				self.y_axis_list[i][x_axis] if x_axis < len(self.y_axis_list[i]) else 0
+				for i in range(self.y_axis_len)
+			)
+			for x_axis in range(self.x_axis_len)
+		]
+
+	def space_needed(self):
+		return sum(self.x_axis_sizes) + self.spacing * (len(self.x_axis_sizes) - 1)
+
+	def partition(self, items):
+		return [
+			items[i * self.x_axis_len : i * self.x_axis_len + self.x_axis_len]
+			for i in range(self.y_axis_len)
+		]
+
+
+def original_best_flow_scenario(widget_sizes, container_size, spacing):
+	"""
+	The search used before "scenario_fits()", kept here for comparison.
+	"""
+	x_axis_count = 1
+	cumulative_size = 0
+	for widget_size in widget_sizes:
+		cumulative_size += widget_size
+		if cumulative_size >= container_size:
+			break
+		cumulative_size += spacing
+		x_axis_count += 1
+	flow_scenario = None
+	while x_axis_count > 1:
+		flow_scenario = OriginalFlowScenario(widget_sizes, spacing, x_axis_count)
+		if flow_scenario.space_needed() <= container_size:
+			break
+		x_axis_count -= 1
+	return flow_scenario or OriginalFlowScenario(widget_sizes, spacing, 1)
+
+
+def timed(func, *args):
+	start = perf_counter()
+	result = func(*args)
+	return result, perf_counter() - start
+
+
+def same_result(scenario_a, scenario_b):
+	return scenario_a.x_axis_len == scenario_b.x_axis_len \
+		and scenario_a.x_axis_sizes == scenario_b.x_axis_sizes
+
+
+def check_parity(trials = 2000):
+	print(f'Parity with the original search over {trials} random cases: ', end = '')
+	seed(1)
+	for _ in range(trials):
+		sizes = [ randint(-1, 300) for _ in range(randint(1, 60)) ]
+		container_size = randint(1, 1200)
+		spacing = randint(0, 8)
+		if not same_result(
+			best_flow_scenario(sizes, container_size, spacing),
+			original_best_flow_scenario(sizes, container_size, spacing)
+		):
+			print(f'FAILED with {sizes}, {container_size}, {spacing}')
+			return
+	print('OK')
+
+
+def bench_best_flow_scenario():
+	print(f'best_flow_scenario, container size {CONTAINER_SIZE}:')
+	print(f'  {"widths":>8s} {"original":>10s} {"current":>10s} {"speedup":>8s}')
+	seed(2)
+	for count in (100, 1_000, 10_000):
+		sizes = [ randint(20, 160) for _ in range(count) ]
+		original, original_time = timed(original_best_flow_scenario, sizes, CONTAINER_SIZE, SPACING)
+		current, current_time = timed(best_flow_scenario, sizes, CONTAINER_SIZE, SPACING)
+		assert same_result(original, current)
+		print(f'  {count:8d} {original_time:9.4f}s {current_time:9.4f}s {original_time / current_time:7.1f}x')
+
+
+def fill_ratio(flow_scenario, widget_sizes, container_size):
+	"""
+	Returns the portion of the lines' total length which is taken up by widgets.
+	"""
+	return sum(widget_sizes) / (flow_scenario.y_axis_len * container_size)
+
+
+def bench_balanced_flow_scenario():
+	print(f'Balanced vs grid flow, container size {CONTAINER_SIZE}:')
+	print(f'  {"widths":>8s} {"grid":>10s} {"balanced":>10s} {"grid rows":>10s} {"rows":>6s}'
+		f' {"grid fill":>10s} {"fill":>6s}')
+	seed(4)
+	for count in (100, 1_000, 10_000):
+		sizes = [ randint(20, 400) for _ in range(count) ]
+		grid, grid_time = timed(best_flow_scenario, sizes, CONTAINER_SIZE, SPACING)
+		balanced, balanced_time = timed(balanced_flow_scenario, sizes, CONTAINER_SIZE, SPACING)
+		assert balanced.space_needed() <= CONTAINER_SIZE
+		print(f'  {count:8d} {grid_time:9.4f}s {balanced_time:9.4f}s'
+			f' {grid.y_axis_len:10d} {balanced.y_axis_len:6d}'
+			f' {fill_ratio(grid, sizes, CONTAINER_SIZE):9.1%} {fill_ratio(balanced, sizes, CONTAINER_SIZE):6.1%}')
+
+
+if __name__ == "__main__":
+	check_parity()
+	bench_best_flow_scenario()
+	bench_balanced_flow_scenario()
+
+
+#  end qt_extras/tests/column_layout_benchmark.py
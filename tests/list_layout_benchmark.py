@@ -0,0 +1,125 @@
+#  qt_extras/tests/list_layout_benchmark.py
+#
+#  Copyright 2026 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Times list layout operations on large numbers of widgets.
+
+Run with:
+
+	QT_QPA_PLATFORM=offscreen python3 tests/list_layout_benchmark.py
+
+"""
+from random import Random
+from time import perf_counter
+from PyQt5.QtWidgets import QApplication, QWidget
+from qt_extras.list_layout import VListLayout, GListLayout
+
+ITEM_COUNT = 10_000
+MIXED_ITEM_COUNT = 2_000
+GRID_CELL_COUNT = 5_000
+
+
+def timed(label, func, *args):
+	start = perf_counter()
+	result = func(*args)
+	print(f'  {label:40s} {perf_counter() - start:9.4f}s')
+	return result
+
+
+def linear_lookups(layout, widgets):
+	for widget in widgets:
+		if widget in layout.items:
+			layout.items.index(widget)
+
+def indexed_lookups(layout, widgets):
+	for widget in widgets:
+		if widget in layout:
+			layout.index(widget)
+
+def drag_reorder(layout, count):
+	widget = layout[-1]
+	for _ in range(count):
+		layout.move_previous(widget)
+
+def bench_lookups():
+	print(f'Membership + index() of every item, {ITEM_COUNT} items:')
+	frame = QWidget()
+	layout = VListLayout()
+	frame.setLayout(layout)
+	widgets = [ QWidget(frame) for _ in range(ITEM_COUNT) ]
+	for widget in widgets:
+		layout.append(widget)
+	timed('linear scan of layout.items', linear_lookups, layout, widgets)
+	timed('position index', indexed_lookups, layout, widgets)
+	timed('drag last item up 200 places', drag_reorder, layout, 200)
+
+class ScanningVListLayout(VListLayout):
+	"""
+	VListLayout which looks items up by scanning "self.items", as it used to.
+	"""
+
+	def _position(self, item):
+		if not item in self.items:
+			raise ValueError("Item not in list layout")
+		return self.items.index(item)
+
+def random_removes(layout, count):
+	random = Random(1)
+	for _ in range(count):
+		layout.remove(random.choice(layout.items))
+
+def insert_first_find_last(layout, widgets):
+	for widget in widgets:
+		layout.insert(0, widget)
+		layout.index(layout[-1])
+
+def bench_mixed():
+	print(f'Changes interleaved with lookups, {MIXED_ITEM_COUNT} items:')
+	for label, layout_class in (('scanning', ScanningVListLayout), ('indexed', VListLayout)):
+		frame = QWidget()
+		layout = layout_class()
+		frame.setLayout(layout)
+		layout.extend([ QWidget(frame) for _ in range(MIXED_ITEM_COUNT) ])
+		timed(f'{label}: 500 random remove()', random_removes, layout, 500)
+		widgets = [ QWidget(frame) for _ in range(300) ]
+		timed(f'{label}: insert(0) + index(-1) x300', insert_first_find_last, layout, widgets)
+		timed(f'{label}: drag last up 200 places', drag_reorder, layout, 200)
+
+def bench_grid_insert():
+	print(f'GListLayout insert / remove at position 0, {GRID_CELL_COUNT} cells:')
+	frame = QWidget()
+	layout = GListLayout(8)
+	frame.setLayout(layout)
+	layout.extend([ QWidget(frame) for _ in range(GRID_CELL_COUNT) ])
+	added = layout.add_widget_count
+	timed('insert(0)', layout.insert, 0, QWidget(frame))
+	print(f'  {"addWidget calls":40s} {layout.add_widget_count - added:9d}')
+	timed('remove(layout[0])', layout.remove, layout[0])
+	timed('remove(layout[-2])', layout.remove, layout[-2])
+	print(f'  {"addWidget calls":40s} {layout.add_widget_count - added:9d}')
+
+
+if __name__ == "__main__":
+	app = QApplication([])
+	bench_lookups()
+	bench_mixed()
+	bench_grid_insert()
+
+
+#  end qt_extras/tests/list_layout_benchmark.py
@@ -0,0 +1,138 @@
+#  qt_extras/tests/shuffle_grid_benchmark.py
+#
+#  Copyright 2026 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Times ShuffleGrid batch row operations and sorting against repeated single-row
+calls, checking that both give the same rows.
+
+Run with:
+
+	QT_QPA_PLATFORM=offscreen python3 tests/shuffle_grid_benchmark.py
+
+"""
+from random import seed, shuffle
+from time import perf_counter
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel
+from qt_extras.shuffle_grid import ShuffleGrid
+
+ROW_COUNT = 2_000
+COLUMN_COUNT = 4
+BATCH_SIZE = 100
+MOVE_COUNT = 10
+MOVE_DISTANCE = 200
+SORT_ROW_COUNT = 500
+
+
+def timed(label, func, *args):
+	start = perf_counter()
+	result = func(*args)
+	print(f'  {label:40s} {perf_counter() - start:9.4f}s')
+	return result
+
+
+def make_grid(row_count = ROW_COUNT, names = None):
+	frame = QWidget()
+	grid = ShuffleGrid(frame)
+	for row, name in enumerate(names or range(row_count)):
+		for col, widget in enumerate(make_row(frame, name)):
+			grid.addWidget(widget, row, col)
+	return frame, grid
+
+
+def make_row(frame, name):
+	return [ QLabel(f'{name}.{col}', frame) for col in range(COLUMN_COUNT) ]
+
+
+def contents(grid):
+	return [ [ widget.text() for widget in row ] for row in grid ]
+
+
+def insert_one_by_one(grid, rows, row):
+	for offset, widgets in enumerate(rows):
+		grid.insert_row(widgets, row + offset)
+
+def delete_one_by_one(grid, rows):
+	for row in rows:
+		grid.delete_row(row)
+
+def move_up_one_by_one(grid, rows, distance):
+	for row in rows:
+		for iter_row in range(row, row - distance, -1):
+			grid.move_row_up(iter_row)
+
+def bubble_sort(grid, key):
+	rows = grid.inhabited_row_indexes()
+	for end in range(len(rows) - 1, 0, -1):
+		for index in range(end):
+			if key(grid.row(rows[index])) > key(grid.row(rows[index + 1])):
+				grid.swap_rows(rows[index], rows[index + 1])
+
+def first_number(widgets):
+	return int(widgets[0].text().split('.')[0])
+
+def bench_insert():
+	print(f'Insert {BATCH_SIZE} rows at row 10 of {ROW_COUNT}:')
+	frame_a, grid_a = make_grid()
+	frame_b, grid_b = make_grid()
+	timed('insert_row, one by one', insert_one_by_one, grid_a,
+		[ make_row(frame_a, f'new {index}') for index in range(BATCH_SIZE) ], 10)
+	timed('insert_rows', grid_b.insert_rows,
+		[ make_row(frame_b, f'new {index}') for index in range(BATCH_SIZE) ], 10)
+	assert contents(grid_a) == contents(grid_b)
+
+def bench_delete():
+	print(f'Delete {BATCH_SIZE} rows of {ROW_COUNT}:')
+	_frame_a, grid_a = make_grid()
+	_frame_b, grid_b = make_grid()
+	rows = range(0, ROW_COUNT, ROW_COUNT // BATCH_SIZE)
+	timed('delete_row, one by one', delete_one_by_one, grid_a, rows)
+	timed('delete_rows', grid_b.delete_rows, rows)
+	assert contents(grid_a) == contents(grid_b)
+
+def bench_move():
+	print(f'Move {MOVE_COUNT} rows up {MOVE_DISTANCE} rows, of {ROW_COUNT}:')
+	_frame_a, grid_a = make_grid()
+	_frame_b, grid_b = make_grid()
+	first = ROW_COUNT // 2
+	rows = range(first, first + MOVE_COUNT)
+	timed('move_row_up, one by one', move_up_one_by_one, grid_a, rows, MOVE_DISTANCE)
+	timed('move_rows', grid_b.move_rows, rows, first - MOVE_DISTANCE)
+	assert contents(grid_a) == contents(grid_b)
+
+def bench_sort():
+	print(f'Sort {SORT_ROW_COUNT} shuffled rows:')
+	seed(1)
+	names = list(range(SORT_ROW_COUNT))
+	shuffle(names)
+	_frame_a, grid_a = make_grid(names = names)
+	_frame_b, grid_b = make_grid(names = names)
+	timed('bubble sort with swap_rows', bubble_sort, grid_a, first_number)
+	timed('sort_rows', grid_b.sort_rows, first_number)
+	assert contents(grid_a) == contents(grid_b)
+
+
+if __name__ == "__main__":
+	app = QApplication([])
+	bench_insert()
+	bench_delete()
+	bench_move()
+	bench_sort()
+
+
+#  end qt_extras/tests/shuffle_grid_benchmark.py
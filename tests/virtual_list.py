@@ -0,0 +1,128 @@
+#  qt_extras/tests/virtual_list.py
+#
+#  Copyright 2026 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import logging
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import pyqtSlot
+from PyQt5.QtWidgets import QApplication, QShortcut, QHBoxLayout, QVBoxLayout, \
+							QMainWindow, QWidget, QLabel, QPushButton, QSpinBox
+from qt_extras.virtual_list import VirtualList
+
+ROW_COUNT = 100_000
+REPEATED = 'Repeated row'	# The same str object, in the list many times
+
+
+class MainWindow(QMainWindow):
+
+	def __init__(self):
+		super().__init__()
+		self.quit_shortcut = QShortcut(QKeySequence('Ctrl+Q'), self)
+		self.quit_shortcut.activated.connect(self.close)
+		self.resize(400, 600)
+
+		wid = QWidget(self)
+		self.setCentralWidget(wid)
+		main_layout = QVBoxLayout()
+		wid.setLayout(main_layout)
+
+		lo = QHBoxLayout()
+		lo.setSpacing(6)
+
+		lo.addWidget(QLabel('Index:', self))
+
+		self.spinbox = QSpinBox(self)
+		self.spinbox.setMinimum(0)
+		self.spinbox.setMaximum(ROW_COUNT - 1)
+		lo.addWidget(self.spinbox)
+
+		button = QPushButton('Insert row', self)
+		button.clicked.connect(self.slot_insert_row)
+		lo.addWidget(button)
+
+		button = QPushButton('Remove row', self)
+		button.clicked.connect(self.slot_remove_row)
+		lo.addWidget(button)
+
+		button = QPushButton('Swap first and last', self)
+		button.clicked.connect(self.slot_swap_extents)
+		lo.addWidget(button)
+
+		button = QPushButton('Insert repeated row', self)
+		button.clicked.connect(self.slot_insert_repeated)
+		lo.addWidget(button)
+
+		button = QPushButton('Remove first repeated row', self)
+		button.clicked.connect(self.slot_remove_repeated)
+		lo.addWidget(button)
+
+		main_layout.addItem(lo)
+
+		self.status = QLabel(self)
+		main_layout.addWidget(self.status)
+
+		self.list = VirtualList([ REPEATED if row % 10 == 5 else f'Row {row}' for row in range(ROW_COUNT) ],
+			QLabel, QLabel.setText, self)
+		self.list.sig_len_changed.connect(self.slot_len_changed)
+		main_layout.addWidget(self.list)
+		self.slot_len_changed()
+
+	@pyqtSlot()
+	def slot_len_changed(self):
+		self.spinbox.setMaximum(len(self.list) - 1)
+		self.status.setText(f'{len(self.list)} rows')
+
+	@pyqtSlot()
+	def slot_insert_row(self):
+		self.list.insert(self.spinbox.value(), f'Inserted at {self.spinbox.value()}')
+
+	@pyqtSlot()
+	def slot_remove_row(self):
+		if self.list:
+			self.list.remove(self.list[self.spinbox.value()])
+
+	@pyqtSlot()
+	def slot_swap_extents(self):
+		if len(self.list) > 1:
+			self.list.swap(self.list[0], self.list[-1])
+
+	@pyqtSlot()
+	def slot_insert_repeated(self):
+		self.list.insert(self.spinbox.value(), REPEATED)
+
+	@pyqtSlot()
+	def slot_remove_repeated(self):
+		# Like a list, "index" and "remove" find the first occurrence.
+		if REPEATED in self.list:
+			index = self.list.index(REPEATED)
+			self.list.remove(REPEATED)
+			self.status.setText(f'{len(self.list)} rows, removed row {index}')
+
+
+if __name__ == "__main__":
+	logging.basicConfig(
+		level = logging.DEBUG,
+		format = "[%(filename)24s:%(lineno)-4d] %(message)s"
+	)
+	app = QApplication([])
+	window = MainWindow()
+	window.show()
+	app.exec()
+
+
+#  end qt_extras/tests/virtual_list.py